@@ -28,6 +28,20 @@ target_metadata = Base.metadata
 # Overwrite the sqlalchemy.url in the alembic.ini with the one from settings
 config.set_main_option("sqlalchemy.url", settings.SQLALCHEMY_DATABASE_URL)
 
+# Full-text search objects created by DDL outside the models (see
+# app/models/todo_model.py), which autogenerate would otherwise drop
+SEARCH_TABLE_PREFIX = "todos_fts"
+SEARCH_OBJECTS = {("column", "search_vector"), ("index", "ix_todos_search_vector")}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None:
+        if type_ == "table" and name.startswith(SEARCH_TABLE_PREFIX):
+            return False
+        if (type_, name) in SEARCH_OBJECTS:
+            return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +67,7 @@ def run_migrations_offline() -> None:
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -77,6 +92,7 @@ def run_migrations_online() -> None:
             connection=connection,
             target_metadata=target_metadata,
             render_as_batch=True,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,34 @@
+"""Add todos keyset pagination index
+
+Revision ID: 3b9d2f4c8a1e
+Revises: 683fe37a7960
+Create Date: 2026-10-17 09:12:04.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2f4c8a1e'
+down_revision: Union[str, Sequence[str], None] = '683fe37a7960'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_todos_user_id_is_deleted_updated_at_id',
+            ['user_id', 'is_deleted', 'updated_at', 'id'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.drop_index('ix_todos_user_id_is_deleted_updated_at_id')
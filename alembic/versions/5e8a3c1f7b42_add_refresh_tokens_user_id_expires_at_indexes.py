@@ -0,0 +1,32 @@
+"""Add refresh_tokens user_id and expires_at indexes
+
+Revision ID: 5e8a3c1f7b42
+Revises: 9c41e7a2d5f0
+Create Date: 2026-10-17 11:26:04.518307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a3c1f7b42'
+down_revision: Union[str, Sequence[str], None] = '9c41e7a2d5f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('refresh_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_user_id'))
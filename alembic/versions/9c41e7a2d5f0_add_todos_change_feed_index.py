@@ -0,0 +1,34 @@
+"""Add todos change feed index
+
+Revision ID: 9c41e7a2d5f0
+Revises: 3b9d2f4c8a1e
+Create Date: 2026-10-17 10:02:37.204611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41e7a2d5f0'
+down_revision: Union[str, Sequence[str], None] = '3b9d2f4c8a1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_todos_user_id_updated_at_id',
+            ['user_id', 'updated_at', 'id'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.drop_index('ix_todos_user_id_updated_at_id')
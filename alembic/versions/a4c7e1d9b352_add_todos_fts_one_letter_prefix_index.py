@@ -0,0 +1,47 @@
+"""Add a one-letter prefix index to todos full-text search
+
+Revision ID: a4c7e1d9b352
+Revises: f1c6a8b3d925
+Create Date: 2026-10-17 21:12:48.603127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e1d9b352'
+down_revision: Union[str, Sequence[str], None] = 'f1c6a8b3d925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# FTS5 prefix indexes are fixed when the table is created: recreate it and
+# index the existing rows. The triggers write to it by name and stay as is.
+def _recreate_sqlite_fts(prefix: str) -> list:
+    return [
+        "DROP TABLE IF EXISTS todos_fts",
+        f"""
+        CREATE VIRTUAL TABLE todos_fts USING fts5(
+            title, description, user_key,
+            content='todos_fts_source', content_rowid='rowid', prefix='{prefix}'
+        )
+        """,
+        "INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in _recreate_sqlite_fts("1 2 3"):
+            op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in _recreate_sqlite_fts("2 3"):
+            op.execute(sa.text(statement))
@@ -0,0 +1,93 @@
+"""Add todos full-text search index
+
+Revision ID: b7d4e2a9c613
+Revises: 5e8a3c1f7b42
+Create Date: 2026-10-17 14:02:37.119840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e2a9c613'
+down_revision: Union[str, Sequence[str], None] = '5e8a3c1f7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIEW IF NOT EXISTS todos_fts_source AS
+    SELECT rowid, title, description, replace(user_id, '-', '') AS user_key FROM todos
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        title, description, user_key,
+        content='todos_fts_source', content_rowid='rowid', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, title, description, user_key)
+        VALUES (new.rowid, new.title, new.description, replace(new.user_id, '-', ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description, user_key)
+        VALUES ('delete', old.rowid, old.title, old.description, replace(old.user_id, '-', ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title, description, user_id ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description, user_key)
+        VALUES ('delete', old.rowid, old.title, old.description, replace(old.user_id, '-', ''));
+        INSERT INTO todos_fts(rowid, title, description, user_key)
+        VALUES (new.rowid, new.title, new.description, replace(new.user_id, '-', ''));
+    END
+    """,
+    # Index the existing rows
+    "INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS todos_fts_update",
+    "DROP TRIGGER IF EXISTS todos_fts_delete",
+    "DROP TRIGGER IF EXISTS todos_fts_insert",
+    "DROP TABLE IF EXISTS todos_fts",
+    "DROP VIEW IF EXISTS todos_fts_source",
+]
+
+POSTGRES_UPGRADE = [
+    """
+    ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_todos_search_vector ON todos USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_todos_search_vector",
+    "ALTER TABLE todos DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _statements(sqlite: list, postgresql: list) -> list:
+    return {"sqlite": sqlite, "postgresql": postgresql}.get(op.get_bind().dialect.name, [])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in _statements(SQLITE_UPGRADE, POSTGRES_UPGRADE):
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for statement in _statements(SQLITE_DOWNGRADE, POSTGRES_DOWNGRADE):
+        op.execute(sa.text(statement))
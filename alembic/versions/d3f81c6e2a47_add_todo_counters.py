@@ -0,0 +1,45 @@
+"""Add todo_counters
+
+Revision ID: d3f81c6e2a47
+Revises: b7d4e2a9c613
+Create Date: 2026-10-17 16:41:09.552318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f81c6e2a47'
+down_revision: Union[str, Sequence[str], None] = 'b7d4e2a9c613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('todo_counters',
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('is_completed', sa.Boolean(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'is_completed', 'priority')
+    )
+    # Count the existing live todos
+    op.execute(
+        """
+        INSERT INTO todo_counters (user_id, is_completed, priority, count)
+        SELECT user_id, coalesce(is_completed, false), coalesce(priority, 0), count(*)
+        FROM todos
+        WHERE user_id IS NOT NULL AND is_deleted = false
+        GROUP BY user_id, coalesce(is_completed, false), coalesce(priority, 0)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('todo_counters')
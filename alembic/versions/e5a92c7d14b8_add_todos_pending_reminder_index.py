@@ -0,0 +1,57 @@
+"""Add todos reminder_sent_at and pending reminder index
+
+Revision ID: e5a92c7d14b8
+Revises: d3f81c6e2a47
+Create Date: 2026-10-17 18:12:44.083517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a92c7d14b8'
+down_revision: Union[str, Sequence[str], None] = 'd3f81c6e2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pending_reminder_criteria():
+    return sa.and_(
+        sa.column('reminder_at').is_not(None),
+        sa.column('reminder_sent_at').is_(None),
+        sa.column('is_completed') == sa.false(),
+        sa.column('is_deleted') == sa.false(),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reminders already past are treated as sent, so the scheduler
+    # doesn't fire the whole backlog on its first run
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('reminder_sent_at', sa.DateTime(timezone=True), nullable=True))
+    todos = sa.table('todos', sa.column('reminder_at'), sa.column('reminder_sent_at'))
+    op.execute(
+        todos.update()
+        .where(todos.c.reminder_at < sa.func.current_timestamp())
+        .values(reminder_sent_at=todos.c.reminder_at)
+    )
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_todos_pending_reminder_at',
+            ['reminder_at'],
+            unique=False,
+            sqlite_where=_pending_reminder_criteria(),
+            postgresql_where=_pending_reminder_criteria(),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # A plain ALTER TABLE DROP COLUMN (SQLite 3.35+): a batch table rebuild
+    # would break the full-text search view and triggers on todos
+    op.drop_index('ix_todos_pending_reminder_at', table_name='todos')
+    op.drop_column('todos', 'reminder_sent_at')
@@ -0,0 +1,31 @@
+"""Add todos client_updated_at
+
+Revision ID: f1c6a8b3d925
+Revises: e5a92c7d14b8
+Create Date: 2026-10-17 19:26:03.418275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c6a8b3d925'
+down_revision: Union[str, Sequence[str], None] = 'e5a92c7d14b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('todos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('client_updated_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # A plain ALTER TABLE DROP COLUMN (SQLite 3.35+): a batch table rebuild
+    # would break the full-text search view and triggers on todos
+    op.drop_column('todos', 'client_updated_at')
@@ -2,24 +2,32 @@
 Health check endpoint for monitoring and load balancers.
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.database.session import get_db
+from sqlalchemy.orm import Session
+from app.database.session import DbSession, get_db, get_database_pool_stats, run_db
 from app.utils.response import success_response, server_error_response
 from app.core.config import settings
+from app.core.rate_limit import rate_limiter
+from app.core.security import get_auth_cache_stats, password_pool
+from app.services.reminder_scheduler import reminder_scheduler
+from app.services.token_sweeper import refresh_token_sweeper
 
 router = APIRouter(tags=["System"])
 
 
+def _ping(db: Session):
+    db.execute(text("SELECT 1"))
+
+
 @router.get("/health")
-def health_check(db: Session = Depends(get_db)):
+async def health_check(db: DbSession = Depends(get_db)):
     """
     Health check endpoint.
     Returns service status and database connectivity.
     """
     try:
         # Check database connectivity
-        db.execute(text("SELECT 1"))
+        await run_db(db, _ping)
         db_status = "healthy"
     except Exception:
         db_status = "unhealthy"
@@ -28,7 +36,13 @@ def health_check(db: Session = Depends(get_db)):
         "status": "healthy" if db_status == "healthy" else "degraded",
         "version": settings.VERSION,
         "database": db_status,
-        "service": settings.PROJECT_NAME
+        "service": settings.PROJECT_NAME,
+        "caches": get_auth_cache_stats(),
+        "password_pool": password_pool.stats(),
+        "database_pool": get_database_pool_stats(),
+        "refresh_token_sweeper": refresh_token_sweeper.stats(),
+        "reminder_scheduler": reminder_scheduler.stats(),
+        "rate_limiter": rate_limiter.stats()
     }
     
     if db_status == "healthy":
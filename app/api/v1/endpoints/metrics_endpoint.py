@@ -0,0 +1,79 @@
+"""
+Prometheus scrape endpoint, mounted at the application root.
+"""
+from typing import AbstractSet, Any, Dict, List, Mapping
+
+from anyio.to_thread import current_default_thread_limiter
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import CONTENT_TYPE, format_metric, request_metrics
+from app.core.rate_limit import rate_limiter
+from app.core.security import get_auth_cache_stats, password_pool
+from app.database.session import get_database_pool_stats
+
+router = APIRouter(tags=["System"])
+
+
+def _stats_metrics(
+    prefix: str,
+    help_text: str,
+    stats_by_label: Mapping[str, Dict[str, Any]],
+    label: str,
+    counters: AbstractSet[str] = frozenset(),
+) -> List[str]:
+    """
+    One metric family per numeric stat, labelled by the stats' owner:
+    a `<name>_total` counter for the monotonic stats in `counters`, a gauge
+    for the rest.
+    """
+    names = sorted({
+        name for stats in stats_by_label.values()
+        for name, value in stats.items() if isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+    lines = []
+    for name in names:
+        samples = (({label: owner}, stats[name]) for owner, stats in stats_by_label.items() if name in stats)
+        if name in counters:
+            lines += format_metric(f"{prefix}_{name}_total", "counter", f"{help_text} ({name}).", samples)
+        else:
+            lines += format_metric(f"{prefix}_{name}", "gauge", f"{help_text} ({name}).", samples)
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Request, database pool, threadpool, worker pool and cache metrics in the
+    Prometheus text exposition format.
+    """
+    limiter = current_default_thread_limiter().statistics()
+
+    lines = request_metrics.render()
+    lines += _stats_metrics(
+        "flow_db_pool", "Database connection pool", get_database_pool_stats(), "engine",
+        counters={"connects", "checkouts", "invalidations", "checkout_wait_seconds"},
+    )
+    lines += format_metric(
+        "flow_threadpool_tokens", "gauge", "Threads available to sync endpoints and run_in_threadpool.",
+        [({}, limiter.total_tokens)],
+    )
+    lines += format_metric(
+        "flow_threadpool_borrowed_tokens", "gauge", "Threadpool threads in use.",
+        [({}, limiter.borrowed_tokens)],
+    )
+    lines += format_metric(
+        "flow_threadpool_tasks_waiting", "gauge", "Tasks waiting for a threadpool thread.",
+        [({}, limiter.tasks_waiting)],
+    )
+    lines += _stats_metrics(
+        "flow_worker_pool", "Dedicated worker pool", {password_pool.name: password_pool.stats()}, "pool",
+        counters={"completed", "rejected"},
+    )
+    lines += _stats_metrics("flow_cache", "In-process cache", get_auth_cache_stats(), "cache", counters={"hits", "misses"})
+    lines += _stats_metrics(
+        "flow_rate_limiter", "Rate limiter", {"default": rate_limiter.stats()}, "limiter",
+        counters={"allowed", "limited"},
+    )
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
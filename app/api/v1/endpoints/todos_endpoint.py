@@ -1,396 +1,669 @@
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
+from app.core.config import settings
 from app.core.security import get_current_user
-from app.database.session import get_db
-from app.models.todo_model import TodoModel
+from app.database import todo_counter_crud, todo_crud
+from app.database.session import DbSession, get_db, run_db, run_db_transaction, stream_scalars
 from app.models.user_model import UserModel
-from app.schemas.todo_schema import TodoCreate, TodoUpdate, TodoResponse, BulkTodoCreate, BulkTodoResponse
+from app.schemas.todo_schema import (
+    TodoCreate,
+    TodoUpdate,
+    TodoResponse,
+    TodoExport,
+    BulkTodoCreate,
+    BulkTodoUpdate,
+    BulkTodoDelete,
+    BulkTodoResponse,
+    TodoSyncRequest,
+)
+from app.utils.content_negotiation import MsgPackRoute
+from app.utils.etag import etag_headers, etag_matches, make_etag, not_modified_response
+from app.utils.logger import logger
+from app.utils.ndjson import iter_ndjson_lines
+from app.utils.pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from app.utils.timezone_helper import make_aware
 from app.utils.response import (
     success_response,
     not_found_response,
+    validation_error_response,
+    format_validation_error,
     ErrorCode
 )
 
-api_router = APIRouter(tags=["Todos"])
+api_router = APIRouter(tags=["Todos"], route_class=MsgPackRoute)
+
+# Endpoints are async; database work runs through run_db/run_db_transaction,
+# which use the AsyncSession or hand a sync Session to the threadpool.
+
+
+def _invalid_todo_id_response(todo_id: str):
+    """Return an error response if todo_id isn't a UUID, else None"""
+    try:
+        uuid.UUID(todo_id)
+    except ValueError:
+        return not_found_response(
+            message="Invalid todo ID format",
+            error_code=ErrorCode.VALIDATION_ERROR
+        )
+    return None
+
+
+def _todo_not_found_response(todo_id: str):
+    return not_found_response(
+        message="Todo not found",
+        error_code=ErrorCode.TODO_NOT_FOUND,
+        details={"todo_id": todo_id}
+    )
+
+
+def _todo_etag(todo_id: str, updated_at: datetime) -> str:
+    # The row read back from SQLite is naive; the response model's is aware
+    return make_etag("todo", todo_id, make_aware(updated_at).isoformat())
 
 
 # Retrieve all todos with pagination and filtering
 @api_router.get("/todos")
-def read_todos(
-    cursor: Optional[int] = Query(None, description="Cursor for pagination (timestamp)"),
+async def read_todos(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.pagination.next_cursor"),
     limit: int = Query(20, ge=1, le=100, description="Number of items to return"),
     completed: Optional[bool] = Query(None, alias="is_completed", description="Filter by completion status"),
     priority: Optional[int] = Query(None, ge=0, le=3, description="Filter by priority"),
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
     List todos with cursor-based pagination and filtering.
+
+    The ETag covers the user's todo version and the query parameters; a
+    matching If-None-Match gets 304 without the page being loaded.
     """
-    try:
-        query = db.query(TodoModel).filter(
-            TodoModel.user_id == current_user.id,
-            TodoModel.is_deleted == False  # Filter out soft-deleted todos
+    # Keyset pagination on (updated_at, id)
+    before = None
+    if cursor:
+        try:
+            before = decode_cursor(cursor)
+        except ValueError:
+            return validation_error_response(
+                message="Invalid cursor",
+                details={"cursor": cursor}
+            )
+
+    version = await run_db(db, todo_crud.get_todos_version, current_user.id)
+    etag = make_etag("todos", current_user.id, version, cursor, limit, completed, priority)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    todos_data, has_more = await run_db(
+        db,
+        todo_crud.list_todos,
+        current_user.id,
+        completed=completed,
+        priority=priority,
+        before=before,
+        limit=limit,
+    )
+
+    # Get next cursor (keyset position of the last item)
+    next_cursor = None
+    if has_more and todos_data:
+        last = todos_data[-1]
+        next_cursor = encode_cursor(last.updated_at, last.id)
+
+    meta = {
+        "pagination": {
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        } if next_cursor else None
+    }
+
+    return success_response(
+        data=todos_data,
+        meta=meta,
+        headers=etag_headers(etag)
+    )
+
+
+# Full-text search (declared before /todos/{todo_id} so "search" isn't taken as an ID)
+@api_router.get("/todos/search")
+async def search_todos(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in title or description"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.pagination.next_cursor"),
+    limit: int = Query(20, ge=1, le=50, description="Number of items to return"),
+    db: DbSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Search live todos by title and description, best match first.
+
+    Every word must match a word in the title or description; the last one,
+    still being typed, may match as a prefix. Todos matching every word in
+    the title come first, then the rest; newest first within each group.
+    """
+    terms = todo_crud.parse_search_terms(q)
+    if not terms:
+        return validation_error_response(
+            message="Search query has no words",
+            details={"q": q}
         )
 
-        if completed is not None:
-            query = query.filter(TodoModel.is_completed == completed)
-        
-        if priority is not None:
-            query = query.filter(TodoModel.priority == priority)
-        
-        # Cursor-based pagination using updated_at timestamp
-        if cursor:
-            cursor_dt = datetime.fromtimestamp(cursor, tz=timezone.utc)
-            query = query.filter(TodoModel.updated_at < cursor_dt)
-        
-        # Order by updated_at descending for cursor pagination
-        query = query.order_by(TodoModel.updated_at.desc())
-        
-        # Get one extra to check if there are more
-        todos_list = query.limit(limit + 1).all()
-        
-        has_more = len(todos_list) > limit
-        if has_more:
-            todos_list = todos_list[:limit]
-        
-        # Get next cursor (timestamp of last item's updated_at)
-        next_cursor = None
-        if has_more and todos_list:
-            next_cursor = int(todos_list[-1].updated_at.timestamp())
-        
-        # Convert to response models
-        todos_data = [TodoResponse.model_validate(todo) for todo in todos_list]
-        
-        meta = {
+    after = None
+    if cursor:
+        try:
+            after = decode_search_cursor(cursor)
+        except ValueError:
+            return validation_error_response(
+                message="Invalid cursor",
+                details={"cursor": cursor}
+            )
+
+    results, has_more = await run_db(
+        db, todo_crud.search_todos, current_user.id, terms, after=after, limit=limit
+    )
+
+    next_cursor = None
+    if has_more and results:
+        last, tier = results[-1]
+        next_cursor = encode_search_cursor(tier, last.id)
+
+    return success_response(
+        data=[todo for todo, _ in results],
+        meta={
             "pagination": {
                 "next_cursor": next_cursor,
                 "has_more": has_more
             } if next_cursor else None
         }
-        
-        return success_response(
-            data=todos_data,
-            meta=meta
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    )
 
 
-# Retrieve a single todo
-@api_router.get("/todos/{todo_id}")
-def read_todo(
-    todo_id: str,
-    db: Session = Depends(get_db),
+# Counts for badges (declared before /todos/{todo_id} so "stats" isn't taken as an ID)
+@api_router.get("/todos/stats")
+async def read_todo_stats(
+    db: DbSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
-    Get a single todo by ID.
+    Count live todos: open, completed, and both per priority.
+
+    Served from the todo_counters table, which every write path keeps
+    current in its own transaction, so no todos are scanned.
     """
-    try:
-        # Validate UUID format
+    stats = await run_db(db, todo_counter_crud.get_todo_stats, current_user.id)
+    return success_response(data=stats)
+
+
+# Delta sync feed (declared before /todos/{todo_id} so "changes" isn't taken as an ID)
+@api_router.get("/todos/changes")
+async def read_todo_changes(
+    since: Optional[str] = Query(None, description="Opaque sync token from meta.sync.next_token"),
+    limit: int = Query(100, ge=1, le=500, description="Number of changes to return"),
+    db: DbSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    List todos created, updated or deleted since a sync token.
+
+    Soft-deleted todos are returned as tombstones (isDeleted=true). Omit
+    `since` for the initial sync, then keep passing `next_token` back until
+    `has_more` is false.
+
+    Once caught up, the token stays SYNC_CHANGES_OVERLAP_SECONDS behind the
+    server clock: a write is stamped before its transaction commits, so a
+    slow transaction can commit rows older than a token already handed out.
+    Changes from that window are sent again (clients apply them
+    idempotently by id) until it has passed; then the feed settles to empty
+    pages.
+    """
+    after = None
+    if since:
         try:
-            uuid.UUID(todo_id)
+            after = decode_cursor(since)
         except ValueError:
-            return not_found_response(
-                message="Invalid todo ID format",
-                error_code=ErrorCode.VALIDATION_ERROR
+            return validation_error_response(
+                message="Invalid sync token",
+                details={"since": since}
             )
-        
-        todo = db.query(TodoModel).filter(
-            TodoModel.id == todo_id,
-            TodoModel.user_id == current_user.id,
-            TodoModel.is_deleted == False
-        ).first()
-        
-        if not todo:
-            return not_found_response(
-                message="Todo not found",
-                error_code=ErrorCode.TODO_NOT_FOUND,
-                details={"todo_id": todo_id}
+
+    changes_data, has_more = await run_db(
+        db, todo_crud.list_todo_changes, current_user.id, after=after, limit=limit
+    )
+
+    # An empty page keeps the client's token so nothing is missed
+    next_token = since
+    if changes_data:
+        last = changes_data[-1]
+        position, item_id = make_aware(last.updated_at), last.id
+        if not has_more:
+            watermark = datetime.now(timezone.utc) - timedelta(seconds=settings.SYNC_CHANGES_OVERLAP_SECONDS)
+            if position > watermark:
+                # Before every change still inside the overlap window
+                position, item_id = watermark, ""
+        next_token = encode_cursor(position, item_id)
+
+    return success_response(
+        data=changes_data,
+        meta={
+            "sync": {
+                "next_token": next_token,
+                "has_more": has_more
+            }
+        }
+    )
+
+
+@api_router.get("/todos/export")
+async def export_todos(
+    include_deleted: bool = Query(False, description="Include soft-deleted todos (tombstones)"),
+    db: DbSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Stream every todo as NDJSON, one TodoExport object per line.
+
+    Rows are read in EXPORT_BATCH_SIZE partitions from a server-side cursor,
+    so memory use doesn't grow with the number of todos.
+    """
+    stmt = todo_crud.export_todos_query(current_user.id, include_deleted)
+
+    async def ndjson_lines():
+        async for partition in stream_scalars(db, stmt, settings.EXPORT_BATCH_SIZE):
+            yield "".join(
+                TodoExport.model_validate(todo).model_dump_json(exclude_none=True) + "\n"
+                for todo in partition
             )
-        
-        return success_response(
-            data=TodoResponse.model_validate(todo)
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+
+    return StreamingResponse(
+        ndjson_lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="todos.ndjson"'}
+    )
+
+
+# Retrieve a single todo
+@api_router.get("/todos/{todo_id}")
+async def read_todo(
+    todo_id: str,
+    if_none_match: Optional[str] = Header(None),
+    db: DbSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Get a single todo by ID.
+
+    The ETag is derived from the row's updated_at; a matching
+    If-None-Match gets 304 without the row being loaded.
+    """
+    error = _invalid_todo_id_response(todo_id)
+    if error:
+        return error
+
+    if if_none_match:
+        version = await run_db(db, todo_crud.get_todo_version, current_user.id, todo_id)
+        if version is None:
+            return _todo_not_found_response(todo_id)
+        etag = _todo_etag(todo_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
+
+    todo = await run_db(db, todo_crud.get_todo, current_user.id, todo_id)
+
+    if not todo:
+        return _todo_not_found_response(todo_id)
+
+    return success_response(
+        data=todo,
+        headers=etag_headers(_todo_etag(todo_id, todo.updated_at))
+    )
 
 
 # Create a new todo
 @api_router.post("/todos")
-def create_todo(
+async def create_todo(
     payload: TodoCreate,
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Create a new todo.
     """
-    try:
-        new_todo = TodoModel(
-            id=str(uuid.uuid4()),
-            title=payload.title,
-            description=payload.description,
-            priority=payload.priority,
-            reminder_at=payload.reminder_at,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-            is_completed=payload.is_completed,
-            is_deleted=payload.is_deleted,
-            is_synced=payload.is_synced,
-            user_id=current_user.id,
-        )
+    todo = await run_db_transaction(db, todo_crud.create_todo, current_user.id, payload)
 
-        db.add(new_todo)
-        db.commit()
-        db.refresh(new_todo)
-
-        return success_response(
-            data=TodoResponse.model_validate(new_todo),
-            message="Todo created successfully",
-            status_code=201
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    return success_response(
+        data=todo,
+        message="Todo created successfully",
+        status_code=201
+    )
 
 
 @api_router.post("/todos/bulk/create")
-def bulk_create_todos(
+async def bulk_create_todos(
     payload: BulkTodoCreate,
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Create multiple todos in a single transaction.
+
+    Items are validated individually; invalid ones are reported by index
+    and the rest are written with one multi-row INSERT.
     """
-    created = []
+    if len(payload.todos) > settings.BULK_CREATE_MAX_ITEMS:
+        return validation_error_response(
+            message=f"Too many todos (max {settings.BULK_CREATE_MAX_ITEMS})",
+            details={"count": len(payload.todos)}
+        )
+
+    valid = []
     failed = []
-    
-    try:
-        for idx, todo_data in enumerate(payload.todos):
+    for idx, item in enumerate(payload.todos):
+        try:
+            valid.append(TodoCreate.model_validate(item))
+        except ValidationError as e:
+            failed.append({"index": idx, "error": format_validation_error(e)})
+
+    # Commit all successful creations in one transaction
+    created_data = await run_db_transaction(
+        db, todo_crud.bulk_insert_todos, current_user.id, valid
+    )
+
+    return success_response(
+        data={
+            "created": created_data,
+            "failed": failed,
+            "created_count": len(created_data),
+            "failed_count": len(failed)
+        },
+        message=f"Bulk create completed: {len(created_data)} created, {len(failed)} failed"
+    )
+
+
+@api_router.post("/todos/import")
+async def import_todos(
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Import todos from an NDJSON request body, one TodoExport object per
+    line, so an export can be imported as is. Unknown keys are rejected.
+
+    The body is read incrementally and valid lines are committed every
+    IMPORT_CHUNK_SIZE rows, so memory stays flat for large files. Chunks
+    committed before a failure stay committed. Invalid lines are reported
+    by line number.
+    """
+    chunk_size = max(settings.IMPORT_CHUNK_SIZE, 1)
+    pending: List[TodoCreate] = []
+    failed = []
+    failed_count = 0
+    imported_count = 0
+    chunks_committed = 0
+    line_number = 0
+
+    async def commit_pending():
+        nonlocal imported_count, chunks_committed
+        imported_count += await run_db_transaction(
+            db, todo_crud.import_todos, current_user.id, pending
+        )
+        chunks_committed += 1
+        pending.clear()
+        logger.info(
+            f"Todo import for user {current_user.id}: chunk {chunks_committed} committed, "
+            f"{imported_count} imported so far"
+        )
+
+    async for line in iter_ndjson_lines(request.stream(), settings.IMPORT_MAX_LINE_BYTES):
+        line_number += 1
+        if line is None:
+            error = f"Line exceeds {settings.IMPORT_MAX_LINE_BYTES} bytes"
+        elif not line.strip():
+            continue
+        else:
             try:
-                new_todo = TodoModel(
-                    id=str(uuid.uuid4()),
-                    title=todo_data.title,
-                    description=todo_data.description,
-                    priority=todo_data.priority,
-                    reminder_at=todo_data.reminder_at,
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc),
-                    is_completed=todo_data.is_completed,
-                    is_deleted=todo_data.is_deleted,
-                    is_synced=todo_data.is_synced,
-                    user_id=current_user.id,
-                )
-                db.add(new_todo)
-                created.append(new_todo)
-            except Exception as e:
-                failed.append({"index": idx, "error": str(e)})
-        
-        # Commit all successful creations in one transaction
-        db.commit()
-        
-        # Refresh all created todos
-        for todo in created:
-            db.refresh(todo)
-        
-        created_data = [TodoResponse.model_validate(todo) for todo in created]
-        
-        return success_response(
-            data={
-                "created": created_data,
-                "failed": failed,
-                "created_count": len(created),
-                "failed_count": len(failed)
-            },
-            message=f"Bulk create completed: {len(created)} created, {len(failed)} failed"
+                pending.append(TodoExport.model_validate_json(line))
+                error = None
+            except ValidationError as e:
+                error = format_validation_error(e)
+
+        if error is not None:
+            failed_count += 1
+            if len(failed) < settings.IMPORT_MAX_REPORTED_ERRORS:
+                failed.append({"line": line_number, "error": error})
+        elif len(pending) >= chunk_size:
+            await commit_pending()
+
+    if pending:
+        await commit_pending()
+
+    return success_response(
+        data={
+            "imported_count": imported_count,
+            "failed_count": failed_count,
+            "chunks_committed": chunks_committed,
+            "lines_read": line_number,
+            "failed": failed,
+        },
+        message=f"Import completed: {imported_count} imported, {failed_count} failed"
+    )
+
+
+def _check_bulk_ids(ids: List[str]):
+    """Return an error response if a bulk id list is too long, else None"""
+    if len(ids) > settings.BULK_UPDATE_MAX_IDS:
+        return validation_error_response(
+            message=f"Too many ids (max {settings.BULK_UPDATE_MAX_IDS})",
+            details={"count": len(ids)}
+        )
+    return None
+
+
+# Declared before /todos/{todo_id} so "bulk" isn't taken as an ID
+@api_router.patch("/todos/bulk")
+async def bulk_patch_todos(
+    payload: BulkTodoUpdate,
+    current_user: UserModel = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Partially update many todos with a single UPDATE.
+    """
+    error = _check_bulk_ids(payload.ids)
+    if error:
+        return error
+
+    update_data = payload.changes.model_dump(exclude_unset=True)
+    if not update_data:
+        return validation_error_response(message="No fields to update")
+
+    updated_ids = await run_db_transaction(
+        db, todo_crud.bulk_update_todos, current_user.id, payload.ids, update_data
+    )
+
+    updated = set(updated_ids)
+    return success_response(
+        data={
+            "updated_ids": updated_ids,
+            "not_found_ids": [todo_id for todo_id in dict.fromkeys(payload.ids) if todo_id not in updated],
+            "updated_count": len(updated_ids)
+        },
+        message=f"Bulk update completed: {len(updated_ids)} todos updated"
+    )
+
+
+@api_router.delete("/todos/bulk")
+async def bulk_delete_todos(
+    payload: BulkTodoDelete,
+    current_user: UserModel = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Soft delete many todos with a single UPDATE.
+    """
+    error = _check_bulk_ids(payload.ids)
+    if error:
+        return error
+
+    deleted_ids = await run_db_transaction(
+        db, todo_crud.bulk_update_todos, current_user.id, payload.ids, {"is_deleted": True}
+    )
+
+    deleted = set(deleted_ids)
+    return success_response(
+        data={
+            "deleted_ids": deleted_ids,
+            "not_found_ids": [todo_id for todo_id in dict.fromkeys(payload.ids) if todo_id not in deleted],
+            "deleted_count": len(deleted_ids)
+        },
+        message=f"Bulk delete completed: {len(deleted_ids)} todos deleted"
+    )
+
+
+@api_router.post("/todos/sync")
+async def sync_todos(
+    payload: TodoSyncRequest,
+    current_user: UserModel = Depends(get_current_user),
+    db: DbSession = Depends(get_db),
+):
+    """
+    Apply an ordered batch of offline create/update/delete operations.
+
+    All operations run in one transaction with last-write-wins resolution
+    on `updatedAt`; each gets its own result (applied, conflict, not_found
+    or invalid) in request order.
+    """
+    if len(payload.operations) > settings.SYNC_MAX_OPERATIONS:
+        return validation_error_response(
+            message=f"Too many operations (max {settings.SYNC_MAX_OPERATIONS})",
+            details={"count": len(payload.operations)}
         )
-    except Exception as e:
-        db.rollback()
-        raise
+
+    results = await run_db_transaction(
+        db, todo_crud.apply_sync_operations, current_user.id, payload.operations
+    )
+
+    applied = sum(1 for result in results if result["status"] == "applied")
+    return success_response(
+        data={
+            "results": results,
+            "applied_count": applied,
+            "rejected_count": len(results) - applied
+        },
+        message=f"Sync completed: {applied} applied, {len(results) - applied} rejected"
+    )
 
 
 # Update an existing todo (full update)
 @api_router.put("/todos/{todo_id}")
-def update_todo(
+async def update_todo(
     todo_id: str,
     payload: TodoUpdate,
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Full update of a todo.
     """
-    try:
-        # Validate UUID format
-        try:
-            uuid.UUID(todo_id)
-        except ValueError:
-            return not_found_response(
-                message="Invalid todo ID format",
-                error_code=ErrorCode.VALIDATION_ERROR
-            )
-        
-        todo = db.query(TodoModel).filter(
-            TodoModel.id == todo_id,
-            TodoModel.user_id == current_user.id,
-            TodoModel.is_deleted == False
-        ).first()
-        
-        if not todo:
-            return not_found_response(
-                message="Todo not found",
-                error_code=ErrorCode.TODO_NOT_FOUND,
-                details={"todo_id": todo_id}
-            )
+    error = _invalid_todo_id_response(todo_id)
+    if error:
+        return error
 
-        update_data = payload.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(todo, key, value)
+    todo = await run_db_transaction(
+        db,
+        todo_crud.update_todo,
+        current_user.id,
+        todo_id,
+        payload.model_dump(exclude_unset=True),
+    )
 
-        todo.updated_at = datetime.now(timezone.utc)
-        
-        db.commit()
-        db.refresh(todo)
+    if not todo:
+        return _todo_not_found_response(todo_id)
 
-        return success_response(
-            data=TodoResponse.model_validate(todo),
-            message="Todo updated successfully"
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    return success_response(
+        data=todo,
+        message="Todo updated successfully"
+    )
 
 
 # Partial update (PATCH) - recommended for sync
 @api_router.patch("/todos/{todo_id}")
-def patch_todo(
+async def patch_todo(
     todo_id: str,
     payload: TodoUpdate,
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Partial update of a todo (recommended for sync operations).
     """
-    try:
-        # Validate UUID format
-        try:
-            uuid.UUID(todo_id)
-        except ValueError:
-            return not_found_response(
-                message="Invalid todo ID format",
-                error_code=ErrorCode.VALIDATION_ERROR
-            )
-        
-        todo = db.query(TodoModel).filter(
-            TodoModel.id == todo_id,
-            TodoModel.user_id == current_user.id,
-            TodoModel.is_deleted == False
-        ).first()
-        
-        if not todo:
-            return not_found_response(
-                message="Todo not found",
-                error_code=ErrorCode.TODO_NOT_FOUND,
-                details={"todo_id": todo_id}
-            )
+    error = _invalid_todo_id_response(todo_id)
+    if error:
+        return error
 
-        update_data = payload.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(todo, key, value)
+    todo = await run_db_transaction(
+        db,
+        todo_crud.update_todo,
+        current_user.id,
+        todo_id,
+        payload.model_dump(exclude_unset=True),
+    )
 
-        todo.updated_at = datetime.now(timezone.utc)
-        
-        db.commit()
-        db.refresh(todo)
+    if not todo:
+        return _todo_not_found_response(todo_id)
 
-        return success_response(
-            data=TodoResponse.model_validate(todo),
-            message="Todo updated successfully"
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    return success_response(
+        data=todo,
+        message="Todo updated successfully"
+    )
 
 
 # Delete a todo (soft delete)
 @api_router.delete("/todos/{todo_id}")
-def delete_todo(
+async def delete_todo(
     todo_id: str,
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     """
     Soft delete a todo (sets deleted=true).
     """
-    try:
-        # Validate UUID format
-        try:
-            uuid.UUID(todo_id)
-        except ValueError:
-            return not_found_response(
-                message="Invalid todo ID format",
-                error_code=ErrorCode.VALIDATION_ERROR
-            )
-        
-        todo = db.query(TodoModel).filter(
-            TodoModel.id == todo_id,
-            TodoModel.user_id == current_user.id,
-            TodoModel.is_deleted == False
-        ).first()
-        
-        if not todo:
-            return not_found_response(
-                message="Todo not found",
-                error_code=ErrorCode.TODO_NOT_FOUND,
-                details={"todo_id": todo_id}
-            )
+    error = _invalid_todo_id_response(todo_id)
+    if error:
+        return error
 
-        # Soft delete
-        todo.is_deleted = True
-        todo.updated_at = datetime.now(timezone.utc)
-        
-        db.commit()
+    deleted = await run_db_transaction(db, todo_crud.soft_delete_todo, current_user.id, todo_id)
 
-        return success_response(
-            data={"todo_id": todo_id},
-            message="Todo deleted successfully"
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    if not deleted:
+        return _todo_not_found_response(todo_id)
+
+    return success_response(
+        data={"todo_id": todo_id},
+        message="Todo deleted successfully"
+    )
 
 
 # Delete All Todos (For Testing Purposes)
 @api_router.delete("/todos")
-def delete_all_todos(
-    db: Session = Depends(get_db),
+async def delete_all_todos(
+    db: DbSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
     """
     Delete all todos for the current user (for testing purposes).
     """
-    try:
-        count = db.query(TodoModel).filter(
-            TodoModel.user_id == current_user.id,
-            TodoModel.is_deleted == False
-        ).update({"is_deleted": True, "updated_at": datetime.now(timezone.utc)})
-        
-        db.commit()
-        
-        return success_response(
-            data={"deleted_count": count},
-            message=f"All todos deleted successfully ({count} todos)"
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    count = await run_db_transaction(db, todo_crud.soft_delete_all_todos, current_user.id)
+
+    return success_response(
+        data={"deleted_count": count},
+        message=f"All todos deleted successfully ({count} todos)"
+    )
@@ -1,18 +1,16 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_cached_user
 from app.schemas.user_schema import UserResponse
 from app.models.user_model import UserModel
-from app.models.todo_model import TodoModel
-from app.models.refresh_token_model import RefreshTokenModel
-from app.database.session import get_db
+from app.database.session import DbSession, get_db, run_db_transaction
+from app.database.user_crud import delete_user_account
 from app.utils.response import success_response
 
 router = APIRouter()
 
 
 @router.get("/me")
-def read_users_me(current_user: UserModel = Depends(get_current_user)):
+async def read_users_me(current_user: UserModel = Depends(get_current_user)):
     """
     Get current user information.
     """
@@ -23,38 +21,24 @@ def read_users_me(current_user: UserModel = Depends(get_current_user)):
 
 
 @router.delete("/me")
-def delete_account(
+async def delete_account(
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DbSession = Depends(get_db)
 ):
     """
     Delete the current user's account and all associated data.
     """
-    try:
-        user_id = current_user.id
-        
-        # Delete all todos (hard delete for account deletion)
-        todos_count = db.query(TodoModel).filter(
-            TodoModel.user_id == user_id
-        ).delete()
-        
-        # Delete all refresh tokens
-        tokens_count = db.query(RefreshTokenModel).filter(
-            RefreshTokenModel.user_id == user_id
-        ).delete()
-        
-        # Delete the user
-        db.delete(current_user)
-        db.commit()
-        
-        return success_response(
-            data={
-                "user_id": user_id,
-                "todos_deleted": todos_count,
-                "tokens_deleted": tokens_count
-            },
-            message="Account deleted successfully"
-        )
-    except Exception as e:
-        db.rollback()
-        raise
+    user_id = current_user.id
+
+    # Hard delete todos, refresh tokens and the user in one transaction
+    todos_count, tokens_count = await run_db_transaction(db, delete_user_account, user_id)
+    invalidate_cached_user(user_id)
+
+    return success_response(
+        data={
+            "user_id": user_id,
+            "todos_deleted": todos_count,
+            "tokens_deleted": tokens_count
+        },
+        message="Account deleted successfully"
+    )
@@ -10,7 +10,7 @@ api_router = APIRouter()
 
 
 @api_router.get("/")
-def home():
+async def home():
     return success_response(
         data={"message": "Flow Backend API is working 🚀"},
         message="API is operational"
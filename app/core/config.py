@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,9 +14,91 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    # Background purge of expired refresh tokens (interval 0 to disable)
+    REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS: int = 3600
+    REFRESH_TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    REFRESH_TOKEN_SWEEP_MAX_BATCHES: int = 100
+
+    # Rate limiting: "<requests>/<seconds>" token buckets per user, or per IP
+    # for anonymous requests; an empty budget disables that limit
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "600/60"
+    # Keyed by method and route template, e.g. "PUT /api/v1/todos/{todo_id}"
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /api/v1/auth/login": "10/60",
+        "POST /api/v1/auth/register": "5/60",
+        "POST /api/v1/auth/check-email": "20/60",
+        "POST /api/v1/auth/refresh": "30/60",
+    }
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_IDLE_SECONDS: int = 600  # keep >= the longest budget period
+    # Key anonymous clients by the first X-Forwarded-For hop (behind a trusted proxy only)
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = False
 
     # Database
     SQLALCHEMY_DATABASE_URL: str
+    # Serve requests through AsyncSession; False keeps the sync Session + threadpool path
+    DATABASE_ASYNC: bool = True
+    # Defaults to SQLALCHEMY_DATABASE_URL with its async driver (aiosqlite/asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Pool sizing applies to server databases and file-backed SQLite
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 to disable
+    # Test each connection on checkout; unset means on for server databases
+    # and off for SQLite, whose local file connections don't go stale
+    DB_POOL_PRE_PING: Optional[bool] = None
+    # SQLite PRAGMAs applied to every new connection (empty string to skip)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # bytes, 0 to disable
+
+    # Metrics
+    METRICS_ENABLED: bool = True
+    # Upper bounds (seconds) of the request latency histogram buckets
+    METRICS_LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+    # SQL instrumentation: per-request query count/time as Server-Timing
+    SQL_TIMING_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # log statements at least this slow, 0 to disable
+    QUERY_COUNT_WARN_THRESHOLD: int = 0  # warn when a request runs more queries, 0 to disable
+
+    # Profiling: cProfile requests sending X-Profile: <PROFILING_SECRET>, or a
+    # random PROFILING_SAMPLE_RATE fraction; not installed unless enabled
+    PROFILING_ENABLED: bool = False
+    PROFILING_SECRET: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "./profiles"
+
+    # Sync
+    SYNC_MAX_OPERATIONS: int = 500
+    # How far back a caught-up /todos/changes token rewinds, so writes
+    # stamped before a read but committed after it are still delivered
+    SYNC_CHANGES_OVERLAP_SECONDS: int = 5
+    BULK_CREATE_MAX_ITEMS: int = 5000
+    BULK_UPDATE_MAX_IDS: int = 500
+    EXPORT_BATCH_SIZE: int = 500
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_MAX_LINE_BYTES: int = 65536
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Reminders: upcoming reminders within the window are held in memory and
+    # dispatched to the sink ("log", or "queue" for an in-process consumer)
+    REMINDER_SCHEDULER_ENABLED: bool = True
+    REMINDER_WINDOW_SECONDS: int = 3600
+    REMINDER_MAX_PENDING: int = 10000
+    # Full reload of the window from the index; at most REMINDER_WINDOW_SECONDS
+    REMINDER_RELOAD_INTERVAL_SECONDS: int = 300
+    REMINDER_DISPATCH_BATCH_SIZE: int = 100
+    REMINDER_SINK: str = "log"
+    REMINDER_QUEUE_SIZE: int = 10000
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=True
@@ -0,0 +1,112 @@
+"""
+In-process request metrics rendered in the Prometheus text format.
+"""
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from app.core.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_metric(
+    name: str, kind: str, help_text: str, samples: Iterable[Tuple[Mapping[str, Any], float]]
+) -> List[str]:
+    """Lines for one metric family; `samples` are (labels, value) pairs."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels)} {_number(value)}" for labels, value in samples)
+    return lines
+
+
+class RequestMetrics:
+    """
+    Request counters and latency histograms per (method, route template).
+
+    Recording is a dict lookup, a bisect over the bucket bounds and a few
+    increments under one lock; label sets are bounded by the route table.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(float(bound) for bound in buckets)
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        # (method, route) -> per-bucket counts, the last one for +Inf
+        self._latency_counts: Dict[Tuple[str, str], List[int]] = {}
+        self._latency_sums: Dict[Tuple[str, str], float] = {}
+        self._in_progress = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self._in_progress += 1
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._in_progress -= 1
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            counts = self._latency_counts.get((method, route))
+            if counts is None:
+                counts = self._latency_counts[(method, route)] = [0] * (len(self.buckets) + 1)
+            counts[index] += 1
+            self._latency_sums[(method, route)] = self._latency_sums.get((method, route), 0.0) + seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._latency_counts.clear()
+            self._latency_sums.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            requests = sorted(self._requests.items())
+            latency = sorted(
+                (key, (list(counts), self._latency_sums[key])) for key, counts in self._latency_counts.items()
+            )
+            in_progress = self._in_progress
+
+        lines = format_metric(
+            "flow_http_requests_total", "counter", "HTTP requests by route template and status.",
+            (({"method": method, "route": route, "status": status}, count)
+             for (method, route, status), count in requests),
+        )
+        lines += format_metric(
+            "flow_http_requests_in_progress", "gauge", "HTTP requests currently being served.",
+            [({}, in_progress)],
+        )
+
+        lines += [
+            "# HELP flow_http_request_duration_seconds HTTP request latency by route template.",
+            "# TYPE flow_http_request_duration_seconds histogram",
+        ]
+        name = "flow_http_request_duration_seconds"
+        for (method, route), (counts, total) in latency:
+            labels = {"method": method, "route": route}
+            cumulative = 0
+            for bound, count in zip([*self.buckets, float("inf")], counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return lines
+
+
+request_metrics = RequestMetrics(settings.METRICS_LATENCY_BUCKETS)
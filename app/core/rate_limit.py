@@ -0,0 +1,115 @@
+"""
+In-process token-bucket rate limiting.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class RateLimit(NamedTuple):
+    """A budget of `capacity` requests refilled evenly over `period` seconds."""
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_rate_limit(value: Optional[str]) -> Optional[RateLimit]:
+    """
+    Parse a "<requests>/<seconds>" budget such as "10/60"; empty means no limit.
+
+    Raises:
+        ValueError: If the value is malformed
+    """
+    if not value:
+        return None
+
+    requests, _, seconds = value.partition("/")
+    limit = RateLimit(int(requests), float(seconds))
+    if limit.capacity <= 0 or limit.period <= 0:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    return limit
+
+
+class TokenBucketLimiter:
+    """
+    Thread-safe token buckets keyed by arbitrary hashable keys.
+
+    Each key holds only (tokens, last_seen). Keys are kept in last-use
+    order, so buckets idle for `idle_seconds` are evicted from the front in
+    O(1) amortized time, and `max_keys` bounds memory under key churn. A
+    bucket idle for longer than its period is full again, so eviction loses
+    nothing as long as `idle_seconds` covers the longest period.
+    """
+
+    def __init__(self, max_keys: int, idle_seconds: float):
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self.allowed = 0
+        self.limited = 0
+        self._buckets: "OrderedDict[Hashable, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable, limit: RateLimit) -> float:
+        """
+        Take one token from `key`'s bucket.
+
+        Returns 0 if the request is allowed, else the seconds until a token
+        is available.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = float(limit.capacity)
+            else:
+                tokens, last_seen = bucket
+                tokens = min(float(limit.capacity), tokens + (now - last_seen) * limit.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+                self.allowed += 1
+            else:
+                retry_after = (1 - tokens) / limit.rate
+                self.limited += 1
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+            return retry_after
+
+    def _evict_idle(self, now: float) -> None:
+        while self._buckets:
+            _, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < self.idle_seconds:
+                break
+            self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "allowed": self.allowed,
+                "limited": self.limited,
+            }
+
+
+rate_limiter = TokenBucketLimiter(
+    max_keys=settings.RATE_LIMIT_MAX_KEYS,
+    idle_seconds=settings.RATE_LIMIT_IDLE_SECONDS,
+)
@@ -1,11 +1,17 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.database.session import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.worker_pool import BoundedWorkerPool, WorkerPoolFull
+
+from app.database.session import DbSession, get_db, run_db
 from app.models.user_model import UserModel
 
 
@@ -23,11 +29,34 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+# Argon2 runs on its own bounded pool (argon2-cffi releases the GIL while
+# hashing), so login bursts queue here instead of starving the AnyIO
+# threadpool that serves every other sync endpoint
+password_pool = BoundedWorkerPool(
+    name="argon2",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def _run_password_task(fn, *args):
+    try:
+        return await password_pool.run(fn, *args)
+    except WorkerPoolFull:
+        raise HTTPException(status_code=503, detail="Server busy, please retry")
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_password_task(hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_password_task(verify_password, plain, hashed)
+
+
 # ----------------------------
 # JWT Settings
 # ----------------------------
-from app.core.config import settings
-
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 
@@ -42,26 +71,90 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Verified claims keyed by a digest of the raw token, kept until the token's
+# "exp" so repeat presentations skip signature checks and JSON parsing
+token_cache = TTLCache(max_size=settings.TOKEN_CACHE_MAX_SIZE, ttl=0)
+
+
+def decode_access_token(raw_token: str) -> dict:
+    """
+    Verify and decode an access token, reusing cached claims until expiry.
+
+    The returned dict may be shared between requests and must not be mutated.
+
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    key = hashlib.sha256(raw_token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(raw_token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, payload, ttl=exp - time.time())
+
+    return payload
+
+
 def create_refresh_token():
     import uuid
 
     return str(uuid.uuid4())
 
 
+# ----------------------------
+# User Cache
+# ----------------------------
+# Column values of resolved users keyed by the token's "sub", so verified
+# tokens don't need a SELECT on every request
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+_USER_COLUMNS = [column.key for column in UserModel.__table__.columns]
+
+
+def get_auth_cache_stats() -> dict:
+    """Hit/miss counters and sizes of the token and user caches."""
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+
+def invalidate_cached_user(user_id: str):
+    """Drop a user from the cache; call after the user row changes or is deleted."""
+    user_cache.delete(user_id)
+
+
+def _load_user_columns(db: Session, user_id: str):
+    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    if not user:
+        return None
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+
+def _detached_user(columns: dict) -> UserModel:
+    # A detached instance never expires or lazy-loads on the event loop;
+    # endpoints that change the user work by id through the CRUD helpers
+    user = UserModel(**columns)
+    make_transient_to_detached(user)
+    return user
+
+
 # ----------------------------
 # Auth Dependency
 # ----------------------------
 bearer_scheme = HTTPBearer()
 
 
-def get_current_user(
+async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_db),
 ):
     raw_token = token.credentials
 
     try:
-        payload = jwt.decode(raw_token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(raw_token)
         user_id = payload.get("sub")
 
         if user_id is None:
@@ -72,9 +165,13 @@ def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    columns = user_cache.get(user_id)
+    if columns is None:
+        columns = await run_db(db, _load_user_columns, user_id)
 
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+        if not columns:
+            raise HTTPException(status_code=401, detail="User not found")
 
-    return user
+        user_cache.set(user_id, columns)
+
+    return _detached_user(columns)
@@ -0,0 +1,89 @@
+"""
+Bounded worker pool for CPU-heavy calls made from async request handlers.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class WorkerPoolFull(Exception):
+    """Raised when a pool's queue is full and new work is rejected."""
+
+
+class BoundedWorkerPool:
+    """
+    Dedicated thread pool with a bounded queue and wait-time statistics.
+
+    Work submitted here does not occupy the AnyIO threadpool used for sync
+    endpoints and dependencies, so a burst of slow calls can only delay
+    other calls to the same pool.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0  # queued + running
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `fn(*args)` on the pool and await its result.
+
+        Raises:
+            WorkerPoolFull: If `max_workers + max_queue` calls are already pending
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise WorkerPoolFull(f"{self.name} pool is saturated")
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def task():
+            wait = time.perf_counter() - submitted
+            with self._lock:
+                self._running += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def done(_future):
+            # Runs even if the awaiting request was cancelled
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+        future = self._executor.submit(task)
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "max_queue": self.max_queue,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
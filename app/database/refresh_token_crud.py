@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.models.refresh_token_model import RefreshTokenModel
+from app.utils.timezone_helper import make_aware
+
+def add_refresh_token(db: Session, user_id: str, token: str, user_agent: str | None = None):
+    db.add(RefreshTokenModel(user_id=user_id, token=token, user_agent=user_agent))
+
+def get_refresh_token(db: Session, token: str):
+    return db.query(RefreshTokenModel).filter(RefreshTokenModel.token == token).first()
+
+def delete_refresh_token(db: Session, token: str) -> int:
+    return db.query(RefreshTokenModel).filter(RefreshTokenModel.token == token).delete()
+
+def delete_user_refresh_tokens(db: Session, user_id: str) -> int:
+    return db.query(RefreshTokenModel).filter(RefreshTokenModel.user_id == user_id).delete()
+
+def rotate_refresh_token(db: Session, token: str, new_token: str) -> Tuple[str, Optional[str]]:
+    """
+    Consume `token` and store `new_token` for the same user and device.
+
+    The old row is deleted first and only a caller whose DELETE removed it
+    goes on, so a token can't be redeemed twice concurrently. Returns
+    ("rotated", user_id), ("expired", user_id) or ("invalid", None); expired
+    tokens are deleted as well. Nothing is committed here, so the delete and
+    insert commit together.
+    """
+    stmt = (
+        delete(RefreshTokenModel)
+        .where(RefreshTokenModel.token == token)
+        .execution_options(synchronize_session=False)
+    )
+    columns = (RefreshTokenModel.user_id, RefreshTokenModel.user_agent, RefreshTokenModel.expires_at)
+
+    if db.get_bind().dialect.delete_returning:
+        row = db.execute(stmt.returning(*columns)).first()
+    else:
+        row = db.execute(select(*columns).where(RefreshTokenModel.token == token)).first()
+        if row is not None and db.execute(stmt).rowcount != 1:
+            row = None
+
+    if row is None:
+        return "invalid", None
+
+    if make_aware(row.expires_at) < datetime.now(timezone.utc):
+        return "expired", row.user_id
+
+    add_refresh_token(db, row.user_id, new_token, row.user_agent)
+    return "rotated", row.user_id
+
+def delete_expired_refresh_tokens(db: Session, now: datetime, limit: int) -> int:
+    """
+    Delete up to `limit` tokens that expired before `now`.
+
+    Uses ix_refresh_tokens_expires_at, so each batch stays cheap however
+    large the table is. Nothing is committed here.
+    """
+    expired_ids = (
+        select(RefreshTokenModel.id)
+        .where(RefreshTokenModel.expires_at < now)
+        .limit(limit)
+        .scalar_subquery()
+    )
+    return db.execute(
+        delete(RefreshTokenModel)
+        .where(RefreshTokenModel.id.in_(expired_ids))
+        .execution_options(synchronize_session=False)
+    ).rowcount
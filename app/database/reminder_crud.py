@@ -0,0 +1,134 @@
+"""
+Queries behind the reminder scheduler, and change tracking for it.
+
+Todo write paths call `track_reminder_changes` with the ids whose
+reminder may have changed. The ids are published to listeners (the
+scheduler) after the session commits and dropped on rollback, so the
+scheduler only ever reacts to committed state.
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.models.todo_model import TodoModel, pending_reminder_criteria
+from app.schemas.todo_schema import TodoReminder
+from app.utils.logger import logger
+from app.utils.timezone_helper import make_aware
+
+# Session.info key: todo id -> whether the todo may now have a reminder to send
+REMINDER_CHANGES = "reminder_changes"
+
+# Bound parameters per IN (...) lookup
+LOOKUP_CHUNK_SIZE = 500
+
+ReminderChangeListener = Callable[[Dict[str, bool]], None]
+_listeners: List[ReminderChangeListener] = []
+
+
+def track_reminder_changes(db: Session, ids: Iterable[str], pending: bool = True) -> None:
+    """
+    Record todos whose reminder changed in this transaction.
+
+    `pending=False` means the todos certainly have no reminder left to
+    send (completed or deleted), so listeners can drop them without a
+    lookup; otherwise they are looked up again.
+    """
+    changes = db.info.setdefault(REMINDER_CHANGES, {})
+    for todo_id in ids:
+        changes[todo_id] = pending
+
+
+def add_reminder_change_listener(listener: ReminderChangeListener) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_reminder_change_listener(listener: ReminderChangeListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_reminder_changes(session: Session) -> None:
+    changes = session.info.pop(REMINDER_CHANGES, None)
+    if not changes:
+        return
+    for listener in list(_listeners):
+        try:
+            listener(changes)
+        except Exception as e:
+            logger.error(f"Reminder change listener failed: {e}", exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_reminder_changes(session: Session) -> None:
+    session.info.pop(REMINDER_CHANGES, None)
+
+
+def list_pending_reminders(db: Session, until: datetime, limit: int) -> List[Tuple[datetime, str]]:
+    """
+    Return (reminder_at, id) of reminders to send up to `until`, earliest
+    first, including overdue ones.
+
+    A range scan of ix_todos_pending_reminder_at; rows outside the index
+    predicate are never read.
+    """
+    return [
+        (make_aware(row.reminder_at), row.id)
+        for row in db.execute(
+            select(TodoModel.reminder_at, TodoModel.id)
+            .where(pending_reminder_criteria(), TodoModel.reminder_at <= until)
+            .order_by(TodoModel.reminder_at, TodoModel.id)
+            .limit(limit)
+        )
+    ]
+
+
+def get_pending_reminders(db: Session, ids: Iterable[str]) -> List[Tuple[datetime, str]]:
+    """Return (reminder_at, id) for those of `ids` with a reminder to send."""
+    ids = list(ids)
+    pending = []
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        pending.extend(
+            (make_aware(row.reminder_at), row.id)
+            for row in db.execute(
+                select(TodoModel.reminder_at, TodoModel.id).where(
+                    TodoModel.id.in_(ids[start:start + LOOKUP_CHUNK_SIZE]),
+                    pending_reminder_criteria(),
+                )
+            )
+        )
+    return pending
+
+
+def claim_due_reminders(db: Session, ids: List[str], now: datetime) -> List[TodoReminder]:
+    """
+    Mark the due reminders among `ids` as sent and return them.
+
+    The UPDATE re-checks the pending criteria, so reminders changed,
+    completed or claimed by another worker since they were scheduled are
+    skipped. Nothing is committed here.
+    """
+    if not ids:
+        return []
+
+    criteria = (TodoModel.id.in_(ids), pending_reminder_criteria(), TodoModel.reminder_at <= now)
+    columns = (TodoModel.id.label("todo_id"), TodoModel.user_id, TodoModel.title, TodoModel.reminder_at)
+    stmt = (
+        update(TodoModel)
+        .where(*criteria)
+        # Keep updated_at: claiming isn't an edit, and its onupdate would
+        # truncate it to whole seconds
+        .values(reminder_sent_at=now, updated_at=TodoModel.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+    if db.get_bind().dialect.update_returning:
+        rows = db.execute(stmt.returning(*columns)).all()
+    else:
+        rows = db.execute(select(*columns).where(*criteria).with_for_update()).all()
+        db.execute(stmt)
+
+    return [TodoReminder.model_validate(row) for row in rows]
@@ -1,17 +1,267 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, TypeVar, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+def _is_sqlite_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+class _CheckoutTimer:
+    """
+    Pool mixin summing the time spent in connect(): waiting for a free
+    connection or opening a new one. The total is kept across dispose().
+    """
+
+    checkout_wait_seconds = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.checkout_wait_seconds += time.perf_counter() - start
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.checkout_wait_seconds = self.checkout_wait_seconds
+        return pool
+
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_engine_options(url: URL) -> Dict[str, Any]:
+    """Engine keyword arguments from Settings, adjusted to the URL's dialect."""
+    pre_ping = settings.DB_POOL_PRE_PING
+    if pre_ping is None:
+        pre_ping = url.get_backend_name() != "sqlite"
+    options: Dict[str, Any] = {"pool_pre_ping": pre_ping}
+
+    if url.get_backend_name() == "sqlite":
+        if url.get_driver_name() == "pysqlite":
+            options["connect_args"] = {"check_same_thread": False}
+        # In-memory databases use a single-connection pool without sizing
+        if _is_sqlite_memory(url):
+            return options
+
+    options.update(
+        poolclass=TimedAsyncAdaptedQueuePool if url.get_dialect().is_async else TimedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def _sqlite_pragmas() -> Dict[str, Any]:
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+    }
+    return {name: value for name, value in pragmas.items() if value not in ("", None)}
+
+
+def install_sqlite_pragmas(target: Engine) -> None:
+    """Apply the configured PRAGMAs to every new connection of a SQLite engine."""
+    if target.dialect.name != "sqlite":
+        return
+
+    pragmas = _sqlite_pragmas()
+
+    @event.listens_for(target, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _lock_sqlite_for_update(orm_execute_state) -> None:
+    """
+    Give SELECT ... FOR UPDATE its meaning on SQLite, which ignores it.
+
+    pysqlite (and aiosqlite) only open a transaction at the first INSERT,
+    UPDATE or DELETE, so rows read before it may be changed by another
+    writer before this one commits. BEGIN IMMEDIATE takes the database
+    write lock before the read instead, so the rows read stay current until
+    commit. Other dialects lock the rows themselves.
+    """
+    if getattr(orm_execute_state.statement, "_for_update_arg", None) is None:
+        return
+    session = orm_execute_state.session
+    if session.get_bind().dialect.name != "sqlite":
+        return
+    connection = session.connection()
+    # Already writing: the lock is held since the transaction's first write
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# Cumulative pool event counts per engine, kept across dispose()
+_pool_events: Dict[Engine, Dict[str, int]] = {}
+POOL_EVENTS = {"connect": "connects", "checkout": "checkouts", "invalidate": "invalidations"}
+
+
+def install_pool_counters(target: Engine) -> None:
+    """Count new connections, checkouts and invalidations of an engine's pool."""
+    counters = _pool_events.setdefault(target, {name: 0 for name in POOL_EVENTS.values()})
+
+    for event_name, counter in POOL_EVENTS.items():
+        def count(*args, counter=counter):
+            counters[counter] += 1
+
+        event.listen(target, event_name, count)
+
+
+def get_pool_stats(target: Engine) -> Dict[str, Any]:
+    """Snapshot of an engine's connection pool gauges and event counters."""
+    pool = target.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+    stats.update(_pool_events.get(target, {}))
+    # Only pools created with a Timed* poolclass (see get_engine_options)
+    if isinstance(pool, _CheckoutTimer):
+        stats["checkout_wait_seconds"] = pool.checkout_wait_seconds
+    return stats
+
+
+engine_url = make_url(settings.SQLALCHEMY_DATABASE_URL)
+engine = create_engine(engine_url, **get_engine_options(engine_url))
+install_sqlite_pragmas(engine)
+install_pool_counters(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
-def get_db():
+# Async drivers used when the configured URL names a sync one
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url() -> URL:
+    url = make_url(settings.ASYNC_DATABASE_URL or settings.SQLALCHEMY_DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine_url = get_async_database_url()
+    async_engine = create_async_engine(async_engine_url, **get_engine_options(async_engine_url))
+    install_sqlite_pragmas(async_engine.sync_engine)
+    install_pool_counters(async_engine.sync_engine)
+    # Nothing may lazy-load outside run_db, so don't expire on commit
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+def get_database_pool_stats() -> Dict[str, Any]:
+    """Pool counters of the engine serving requests (and the sync engine)."""
+    stats = {"sync": get_pool_stats(engine)}
+    if async_engine is not None:
+        stats["async"] = get_pool_stats(async_engine.sync_engine)
+    return stats
+
+
+DbSession = Union[AsyncSession, Session]
+T = TypeVar("T")
+
+
+async def get_db():
+    """Yield an AsyncSession, or a sync Session when DATABASE_ASYNC is off."""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        await run_in_threadpool(db.close)
+
+
+# get_db for code running outside a request, e.g. background services
+db_session = asynccontextmanager(get_db)
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run sync ORM code `fn(session, *args, **kwargs)` against either session type.
+
+    With an AsyncSession the function runs on the event loop through
+    `run_sync` and the async driver; a sync Session is handed to the
+    threadpool. CRUD helpers are therefore written once, against `Session`.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def run_db_transaction(
+    db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Like `run_db`, but commits on success and rolls back on error."""
+
+    def transaction(session: Session) -> T:
+        try:
+            result = fn(session, *args, **kwargs)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+
+    return await run_db(db, transaction)
+
+
+async def stream_scalars(db: DbSession, stmt: Select, batch_size: int) -> AsyncIterator[List[Any]]:
+    """
+    Yield the scalar results of `stmt` in lists of at most `batch_size`.
+
+    Rows are fetched incrementally (yield_per / server-side cursor), so
+    memory stays flat regardless of the result size.
+    """
+    stmt = stmt.execution_options(yield_per=batch_size)
+
+    if isinstance(db, AsyncSession):
+        result = await db.stream_scalars(stmt)
+        async for partition in result.partitions(batch_size):
+            yield partition
+        return
+
+    result = await run_in_threadpool(db.scalars, stmt)
+    try:
+        while True:
+            partition = await run_in_threadpool(result.fetchmany, batch_size)
+            if not partition:
+                break
+            yield partition
+    finally:
+        result.close()
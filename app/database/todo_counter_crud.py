@@ -0,0 +1,139 @@
+"""
+Per-user todo counts by (is_completed, priority), kept in todo_counters.
+
+Every todo write path in todo_crud works out how its change moves todos
+between buckets and applies the deltas in the same transaction, so stats
+are read from a few primary-key rows instead of COUNT(*) over todos. Only
+live (not soft-deleted) todos are counted.
+"""
+from collections import Counter
+from typing import Iterable, Mapping, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.todo_counter_model import TodoCounterModel
+from app.models.todo_model import TodoModel
+from app.schemas.todo_schema import PriorityCounts, TodoStats
+
+# Always reported, even when empty (see TodoBase.priority)
+PRIORITIES = (0, 1, 2, 3)
+
+CountKey = Tuple[bool, int]
+
+# Columns whose changes move a todo between buckets
+COUNTED_COLUMNS = frozenset({"is_completed", "priority", "is_deleted"})
+
+
+def count_key(is_completed: Optional[bool], priority: Optional[int], is_deleted: Optional[bool]) -> Optional[CountKey]:
+    """The bucket a todo is counted in, or None when it isn't counted."""
+    # Live means is_deleted == False, as in the list query; NULL isn't live
+    if is_deleted is not False:
+        return None
+    return bool(is_completed), priority or 0
+
+
+def todo_count_key(todo: TodoModel) -> Optional[CountKey]:
+    return count_key(todo.is_completed, todo.priority, todo.is_deleted)
+
+
+def count_deltas(moves: Iterable[Tuple[Optional[CountKey], Optional[CountKey]]]) -> Counter:
+    """Sum (before, after) bucket moves into per-bucket deltas."""
+    deltas: Counter = Counter()
+    for before, after in moves:
+        if before == after:
+            continue
+        if before is not None:
+            deltas[before] -= 1
+        if after is not None:
+            deltas[after] += 1
+    return deltas
+
+
+def apply_todo_count_deltas(db: Session, user_id: str, deltas: Mapping[CountKey, int]) -> None:
+    """
+    Add `deltas` to the user's counters with one INSERT ... ON CONFLICT.
+
+    The increment happens in the database, so concurrent transactions
+    don't overwrite each other's counts. Nothing is committed here.
+    """
+    rows = [
+        {"user_id": user_id, "is_completed": is_completed, "priority": priority, "count": delta}
+        for (is_completed, priority), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    dialect_insert = postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(TodoCounterModel).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[TodoCounterModel.user_id, TodoCounterModel.is_completed, TodoCounterModel.priority],
+        set_={"count": TodoCounterModel.count + stmt.excluded.count},
+    ))
+
+
+def get_todo_stats(db: Session, user_id: str) -> TodoStats:
+    """The user's live todo counts, from at most 8 counter rows."""
+    by_priority = {priority: PriorityCounts(priority=priority) for priority in PRIORITIES}
+    stats = TodoStats(by_priority=list(by_priority.values()))
+
+    rows = db.execute(
+        select(TodoCounterModel.is_completed, TodoCounterModel.priority, TodoCounterModel.count)
+        .where(TodoCounterModel.user_id == user_id)
+    )
+    for is_completed, priority, count in rows:
+        bucket = by_priority.get(priority)
+        if bucket is None:
+            bucket = by_priority[priority] = PriorityCounts(priority=priority)
+            stats.by_priority.append(bucket)
+        if is_completed:
+            bucket.completed += count
+            stats.completed += count
+        else:
+            bucket.open += count
+            stats.open += count
+
+    stats.total = stats.open + stats.completed
+    return stats
+
+
+def delete_user_todo_counts(db: Session, user_id: str) -> int:
+    return db.execute(delete(TodoCounterModel).where(TodoCounterModel.user_id == user_id)).rowcount
+
+
+def rebuild_todo_counts(db: Session, user_id: Optional[str] = None) -> int:
+    """
+    Recount live todos into todo_counters, for one user or everyone.
+
+    Returns the number of counter rows written. On PostgreSQL the counters
+    table is locked for the transaction, so writers committing meanwhile
+    are either counted by the rebuild or apply their deltas after it.
+    Nothing is committed here.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE todo_counters IN EXCLUSIVE MODE"))
+
+    clear = delete(TodoCounterModel)
+    counts = (
+        select(
+            TodoModel.user_id,
+            func.coalesce(TodoModel.is_completed, False),
+            func.coalesce(TodoModel.priority, 0),
+            func.count(),
+        )
+        .where(TodoModel.user_id.is_not(None), TodoModel.is_deleted == False)
+        .group_by(TodoModel.user_id, func.coalesce(TodoModel.is_completed, False), func.coalesce(TodoModel.priority, 0))
+    )
+    if user_id is not None:
+        clear = clear.where(TodoCounterModel.user_id == user_id)
+        counts = counts.where(TodoModel.user_id == user_id)
+
+    db.execute(clear)
+    return db.execute(
+        insert(TodoCounterModel).from_select(
+            ["user_id", "is_completed", "priority", "count"], counts
+        )
+    ).rowcount
@@ -0,0 +1,523 @@
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import Select, and_, column, func, insert, literal_column, select, table, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.database.reminder_crud import track_reminder_changes
+from app.database.todo_counter_crud import (
+    COUNTED_COLUMNS,
+    apply_todo_count_deltas,
+    count_deltas,
+    count_key,
+    todo_count_key,
+)
+from app.models.todo_model import TodoModel
+from app.schemas.todo_schema import TodoCreate, TodoResponse, TodoSyncOperation, TodoUpdate
+from app.utils.response import format_validation_error
+from app.utils.timezone_helper import make_aware, to_utc
+
+
+def list_todos(
+    db: Session,
+    user_id: str,
+    completed: Optional[bool] = None,
+    priority: Optional[int] = None,
+    before: Optional[Tuple[datetime, str]] = None,
+    limit: int = 20,
+) -> Tuple[List[TodoResponse], bool]:
+    """
+    Return a page of live todos, newest first, and whether more follow.
+
+    `before` is the (updated_at, id) keyset position of the previous page's
+    last item; the query is served by ix_todos_user_id_is_deleted_updated_at_id.
+    """
+    query = db.query(TodoModel).filter(
+        TodoModel.user_id == user_id,
+        TodoModel.is_deleted == False  # Filter out soft-deleted todos
+    )
+
+    if completed is not None:
+        query = query.filter(TodoModel.is_completed == completed)
+
+    if priority is not None:
+        query = query.filter(TodoModel.priority == priority)
+
+    if before is not None:
+        query = query.filter(tuple_(TodoModel.updated_at, TodoModel.id) < tuple_(*before))
+
+    query = query.order_by(TodoModel.updated_at.desc(), TodoModel.id.desc())
+
+    # Get one extra to check if there are more
+    todos_list = query.limit(limit + 1).all()
+
+    return [TodoResponse.model_validate(todo) for todo in todos_list[:limit]], len(todos_list) > limit
+
+
+def list_todo_changes(
+    db: Session,
+    user_id: str,
+    after: Optional[Tuple[datetime, str]] = None,
+    limit: int = 100,
+) -> Tuple[List[TodoResponse], bool]:
+    """
+    Return todos changed after the `after` keyset position, oldest first,
+    including soft-deleted tombstones, and whether more follow.
+
+    Served by ix_todos_user_id_updated_at_id.
+    """
+    query = db.query(TodoModel).filter(TodoModel.user_id == user_id)
+
+    if after is not None:
+        query = query.filter(tuple_(TodoModel.updated_at, TodoModel.id) > tuple_(*after))
+
+    query = query.order_by(TodoModel.updated_at.asc(), TodoModel.id.asc())
+
+    changes = query.limit(limit + 1).all()
+
+    return [TodoResponse.model_validate(todo) for todo in changes[:limit]], len(changes) > limit
+
+
+def export_todos_query(user_id: str, include_deleted: bool = False) -> Select:
+    """All of a user's todos in change order, for streaming with yield_per."""
+    stmt = select(TodoModel).where(TodoModel.user_id == user_id)
+    if not include_deleted:
+        stmt = stmt.where(TodoModel.is_deleted == False)
+    return stmt.order_by(TodoModel.updated_at.asc(), TodoModel.id.asc())
+
+
+def get_todos_version(db: Session, user_id: str) -> Optional[datetime]:
+    """
+    Return the latest updated_at over all of a user's todos.
+
+    Every write path stamps updated_at with the current time and soft
+    deletes keep the row, so it moves whenever any todo is created, updated
+    or deleted. A single seek to the end of the user's range in
+    ix_todos_user_id_updated_at_id, however many todos the user has.
+    """
+    return db.scalar(select(func.max(TodoModel.updated_at)).where(TodoModel.user_id == user_id))
+
+
+def get_todo_version(db: Session, user_id: str, todo_id: str) -> Optional[datetime]:
+    """Return a live todo's updated_at without loading the row, or None."""
+    return db.execute(
+        select(TodoModel.updated_at).where(
+            TodoModel.id == todo_id,
+            TodoModel.user_id == user_id,
+            TodoModel.is_deleted == False
+        )
+    ).scalar_one_or_none()
+
+
+# Terms beyond this are ignored; each one adds a posting-list intersection
+SEARCH_MAX_TERMS = 8
+_search_token = re.compile(r"\w+")
+
+# The FTS5 index created alongside todos (see todo_model.SQLITE_SEARCH_DDL)
+_todos_fts = table("todos_fts", column("rowid"))
+_fts = literal_column("todos_fts")
+_todos_rowid = literal_column("todos.rowid")
+
+
+def parse_search_terms(query: str) -> List[str]:
+    """
+    Split a user's search string into lowercase word terms.
+
+    Only word characters survive, so FTS5 and tsquery operators in the
+    input are never interpreted.
+    """
+    return _search_token.findall(query.lower())[:SEARCH_MAX_TERMS]
+
+
+def _search_sqlite_tier(db: Session, user_id: str, terms: List[str], tier: int, after_id: Optional[str]):
+    # Only the last term, the one still being typed, is a prefix: FTS5
+    # reads a prefix longer than the prefix index ('1 2 3') in full before
+    # matching, while whole words are read only as far as LIMIT needs
+    phrases = " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+    in_title = f"{{title}}: ({phrases})"
+    expression = in_title if tier == 0 else f"{{title description}}: ({phrases}) NOT {in_title}"
+    user_key = user_id.replace("-", "")
+    stmt = (
+        select(TodoModel)
+        .join_from(_todos_fts, TodoModel, _todos_rowid == _todos_fts.c.rowid)
+        .where(_fts.op("MATCH")(f'{{user_key}}: "{user_key}" AND {expression}'))
+    )
+    if after_id is not None:
+        after_rowid = select(_todos_rowid).where(TodoModel.id == after_id).scalar_subquery()
+        stmt = stmt.where(_todos_fts.c.rowid < after_rowid)
+    # FTS5 returns rowids in descending order itself, so LIMIT stops the scan
+    return stmt.order_by(_todos_fts.c.rowid.desc())
+
+
+def _search_postgresql_tier(db: Session, user_id: str, terms: List[str], tier: int, after_id: Optional[str]):
+    vector = literal_column("todos.search_vector")
+    # As on SQLite only the last term is a prefix. Weight A is the title
+    # (see todo_model.POSTGRES_SEARCH_DDL).
+    words, last = terms[:-1], terms[-1]
+    in_title = vector.op("@@")(func.to_tsquery("simple", " & ".join([f"{word}:A" for word in words] + [f"{last}:*A"])))
+    matches = vector.op("@@")(func.to_tsquery("simple", " & ".join(words + [f"{last}:*"])))
+    stmt = select(TodoModel).where(in_title if tier == 0 else and_(matches, ~in_title))
+    if after_id is not None:
+        position = db.execute(
+            select(TodoModel.created_at, TodoModel.id).where(TodoModel.id == after_id)
+        ).one_or_none()
+        if position is None:
+            return None
+        stmt = stmt.where(tuple_(TodoModel.created_at, TodoModel.id) < tuple_(*position))
+    return stmt.order_by(TodoModel.created_at.desc(), TodoModel.id.desc())
+
+
+def search_todos(
+    db: Session,
+    user_id: str,
+    terms: List[str],
+    after: Optional[Tuple[int, str]] = None,
+    limit: int = 20,
+) -> Tuple[List[Tuple[TodoResponse, int]], bool]:
+    """
+    Full-text search of a user's live todos; every term must match, the
+    last one as a prefix.
+
+    Todos matching every term in the title rank first (tier 0), then those
+    needing the description (tier 1); newest first within a tier. Tiers are
+    read in index order and stop at `limit`, so the cost doesn't grow with
+    the number of matches. Returns ([(todo, tier)], has_more); `after` is
+    the (tier, id) position of the previous page's last item.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        build_tier = _search_sqlite_tier
+    else:
+        build_tier = _search_postgresql_tier
+
+    first_tier, after_id = after if after is not None else (0, None)
+    results: List[Tuple[TodoResponse, int]] = []
+    has_more = False
+
+    for tier in range(first_tier, 2):
+        stmt = build_tier(db, user_id, terms, tier, after_id if tier == first_tier else None)
+        if stmt is None:
+            break
+        stmt = stmt.where(TodoModel.user_id == user_id, TodoModel.is_deleted == False)
+
+        # Get one extra to check if there are more
+        remaining = limit - len(results)
+        todos_list = db.execute(stmt.limit(remaining + 1)).scalars().all()
+        results.extend((TodoResponse.model_validate(todo), tier) for todo in todos_list[:remaining])
+        if len(todos_list) > remaining:
+            has_more = True
+            break
+
+    return results, has_more
+
+
+# Columns whose changes can schedule or cancel a todo's reminder
+REMINDER_COLUMNS = frozenset({"reminder_at", "is_completed", "is_deleted"})
+
+
+def _with_reminder_reset(values: Dict[str, Any]) -> Dict[str, Any]:
+    """A new reminder_at is a new reminder, so it hasn't been sent yet."""
+    if "reminder_at" in values:
+        return {**values, "reminder_sent_at": None}
+    return values
+
+
+def _modified_at(todo: TodoModel) -> Optional[datetime]:
+    """When the todo's current state was written, as last-write-wins sees it."""
+    modified_at = todo.client_updated_at or todo.updated_at
+    return make_aware(modified_at) if modified_at is not None else None
+
+
+def _has_pending_reminder(todo: TodoModel) -> bool:
+    return todo.reminder_at is not None and todo.is_completed is False and todo.is_deleted is False
+
+
+def _get_live_todo(db: Session, user_id: str, todo_id: str, for_update: bool = False) -> Optional[TodoModel]:
+    query = db.query(TodoModel).filter(
+        TodoModel.id == todo_id,
+        TodoModel.user_id == user_id,
+        TodoModel.is_deleted == False
+    )
+    if for_update:
+        # Lock the row (on SQLite the database, see session.py) and refresh a
+        # stale copy in the identity map, so the counters' "before" bucket is
+        # the state this change replaces
+        query = query.with_for_update().populate_existing()
+    return query.first()
+
+
+def get_todo(db: Session, user_id: str, todo_id: str) -> Optional[TodoResponse]:
+    todo = _get_live_todo(db, user_id, todo_id)
+    return TodoResponse.model_validate(todo) if todo else None
+
+
+def create_todo(db: Session, user_id: str, payload: TodoCreate) -> TodoResponse:
+    now = datetime.now(timezone.utc)
+    new_todo = TodoModel(
+        id=str(uuid.uuid4()),
+        title=payload.title,
+        description=payload.description,
+        priority=payload.priority,
+        reminder_at=payload.reminder_at,
+        created_at=now,
+        updated_at=now,
+        completed_at=None,
+        is_completed=payload.is_completed,
+        is_deleted=payload.is_deleted,
+        is_synced=payload.is_synced,
+        user_id=user_id,
+    )
+    db.add(new_todo)
+    apply_todo_count_deltas(db, user_id, count_deltas([(None, todo_count_key(new_todo))]))
+    if _has_pending_reminder(new_todo):
+        track_reminder_changes(db, [new_todo.id])
+    return TodoResponse.model_validate(new_todo)
+
+
+def update_todo(db: Session, user_id: str, todo_id: str, values: Dict[str, Any]) -> Optional[TodoResponse]:
+    todo = _get_live_todo(db, user_id, todo_id, for_update=True)
+    if not todo:
+        return None
+
+    before = todo_count_key(todo)
+    for key, value in _with_reminder_reset(values).items():
+        setattr(todo, key, value)
+    todo.updated_at = datetime.now(timezone.utc)
+    todo.client_updated_at = None
+    apply_todo_count_deltas(db, user_id, count_deltas([(before, todo_count_key(todo))]))
+    if not REMINDER_COLUMNS.isdisjoint(values):
+        track_reminder_changes(db, [todo.id], pending=_has_pending_reminder(todo))
+
+    return TodoResponse.model_validate(todo)
+
+
+def soft_delete_todo(db: Session, user_id: str, todo_id: str) -> bool:
+    todo = _get_live_todo(db, user_id, todo_id, for_update=True)
+    if not todo:
+        return False
+
+    apply_todo_count_deltas(db, user_id, count_deltas([(todo_count_key(todo), None)]))
+    if todo.reminder_at is not None:
+        track_reminder_changes(db, [todo.id], pending=False)
+    todo.is_deleted = True
+    todo.updated_at = datetime.now(timezone.utc)
+    todo.client_updated_at = None
+    return True
+
+
+def soft_delete_all_todos(db: Session, user_id: str) -> int:
+    return len(_update_live_todos(db, user_id, None, {"is_deleted": True}))
+
+
+def _new_todo_rows(user_id: str, todos: List[TodoCreate]) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": todo.title,
+            "description": todo.description,
+            "priority": todo.priority,
+            "reminder_at": todo.reminder_at,
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None,
+            "is_completed": todo.is_completed,
+            "is_deleted": todo.is_deleted,
+            "is_synced": todo.is_synced,
+            "user_id": user_id,
+        }
+        for todo in todos
+    ]
+
+
+def _insert_todo_rows(db: Session, user_id: str, rows: List[Dict[str, Any]]) -> None:
+    if rows:
+        db.execute(insert(TodoModel), rows)
+        apply_todo_count_deltas(db, user_id, count_deltas(
+            (None, count_key(row["is_completed"], row["priority"], row["is_deleted"])) for row in rows
+        ))
+        track_reminder_changes(db, (
+            row["id"] for row in rows
+            if row["reminder_at"] is not None and not row["is_completed"] and not row["is_deleted"]
+        ))
+
+
+def bulk_insert_todos(db: Session, user_id: str, todos: List[TodoCreate]) -> List[TodoResponse]:
+    """
+    Insert validated todos with a single multi-row INSERT (executemany).
+
+    Every column, including the shared batch timestamp, is generated here,
+    so responses are built from the inserted values without reading rows
+    back. Nothing is committed here.
+    """
+    rows = _new_todo_rows(user_id, todos)
+    _insert_todo_rows(db, user_id, rows)
+    return [TodoResponse.model_validate(row) for row in rows]
+
+
+def import_todos(db: Session, user_id: str, todos: List[TodoCreate]) -> int:
+    """Like bulk_insert_todos, but returns only the number of rows inserted."""
+    rows = _new_todo_rows(user_id, todos)
+    _insert_todo_rows(db, user_id, rows)
+    return len(rows)
+
+
+def _update_live_todos(db: Session, user_id: str, ids: Optional[List[str]], values: Dict[str, Any]) -> List[str]:
+    """
+    Apply `values` with a single UPDATE to the user's live todos, or to
+    those in `ids`, and return the ids updated.
+
+    When a counted column changes, the rows' current buckets are read
+    (and locked) first to adjust the counters.
+    """
+    criteria = [TodoModel.user_id == user_id, TodoModel.is_deleted == False]
+    if ids is not None:
+        criteria.append(TodoModel.id.in_(ids))
+    stmt = (
+        update(TodoModel)
+        .where(*criteria)
+        .values(**_with_reminder_reset(values), updated_at=datetime.now(timezone.utc), client_updated_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    if COUNTED_COLUMNS.isdisjoint(values):
+        if db.get_bind().dialect.update_returning:
+            updated = list(db.scalars(stmt.returning(TodoModel.id)))
+        else:
+            updated = list(db.scalars(select(TodoModel.id).where(*criteria)))
+            db.execute(stmt)
+    else:
+        rows = db.execute(
+            select(TodoModel.id, TodoModel.is_completed, TodoModel.priority)
+            .where(*criteria)
+            .with_for_update()
+        ).all()
+        db.execute(stmt)
+        apply_todo_count_deltas(db, user_id, count_deltas(
+            (
+                count_key(row.is_completed, row.priority, False),
+                count_key(
+                    values.get("is_completed", row.is_completed),
+                    values.get("priority", row.priority),
+                    values.get("is_deleted", False),
+                ),
+            )
+            for row in rows
+        ))
+        updated = [row.id for row in rows]
+
+    if not REMINDER_COLUMNS.isdisjoint(values):
+        # Completing or deleting certainly cancels; anything else is looked up
+        cancels = values.get("is_completed", False) is not False or values.get("is_deleted", False) is not False
+        track_reminder_changes(db, updated, pending=not cancels)
+    return updated
+
+
+def bulk_update_todos(db: Session, user_id: str, ids: List[str], values: Dict[str, Any]) -> List[str]:
+    """
+    Apply `values` to the user's live todos in `ids` with a single UPDATE.
+
+    Returns the ids actually updated, using RETURNING where the dialect
+    supports it. Nothing is committed here.
+    """
+    if not ids:
+        return []
+    return _update_live_todos(db, user_id, ids, values)
+
+
+def apply_sync_operations(db: Session, user_id: str, operations: List[TodoSyncOperation]) -> List[dict]:
+    """
+    Apply an ordered batch of client operations inside the caller's transaction.
+
+    The user's existing rows are loaded (and locked) with one SELECT, so
+    the counters are adjusted from their current state. An operation wins
+    unless the todo's current state was modified after the client's
+    `updatedAt` (last write wins): the client time of the last synced edit,
+    or updated_at after a server-side edit. Losing operations are reported
+    as conflicts with the server version. Ids of other users' todos are
+    not found, or unavailable to create, without saying whose they are.
+    Nothing is committed here.
+    """
+    ids = {op.id for op in operations}
+    existing = {
+        todo.id: todo
+        for todo in (
+            db.query(TodoModel)
+            .filter(TodoModel.id.in_(ids), TodoModel.user_id == user_id)
+            .with_for_update()
+            .populate_existing()
+        )
+    }
+    create_ids = {op.id for op in operations if op.op == "create"} - existing.keys()
+    taken = set()
+    if create_ids:
+        taken = set(db.scalars(select(TodoModel.id).where(TodoModel.id.in_(create_ids))))
+    # Bucket of each todo touched, before the batch, for the counters
+    counted_before = {}
+    reminders_touched = set()
+    now = datetime.now(timezone.utc)
+    results = []
+
+    for index, op in enumerate(operations):
+        result = {"index": index, "id": op.id, "op": op.op}
+        results.append(result)
+
+        try:
+            uuid.UUID(op.id)
+        except ValueError:
+            result.update(status="invalid", error="Invalid todo ID format")
+            continue
+
+        todo = existing.get(op.id)
+        if todo is None and op.op != "create":
+            result.update(status="not_found", error="Todo not found")
+            continue
+
+        if todo is None and op.id in taken:
+            result.update(status="invalid", error="Todo ID is not available")
+            continue
+
+        client_updated_at = to_utc(op.updated_at)
+        if todo is not None:
+            modified_at = _modified_at(todo)
+            if modified_at is not None and modified_at > client_updated_at:
+                result.update(status="conflict", todo=TodoResponse.model_validate(todo))
+                continue
+
+        try:
+            if op.op == "create":
+                # Replayed creates for an existing todo become full updates
+                values = TodoCreate.model_validate(op.data or {}).model_dump()
+            elif op.op == "update":
+                values = TodoUpdate.model_validate(op.data or {}).model_dump(exclude_unset=True)
+            else:
+                values = {"is_deleted": True}
+        except ValidationError as e:
+            result.update(status="invalid", error=format_validation_error(e))
+            continue
+
+        if todo is None:
+            todo = TodoModel(id=op.id, user_id=user_id, created_at=now, completed_at=None)
+            db.add(todo)
+            existing[op.id] = todo
+            counted_before.setdefault(op.id, None)
+        else:
+            counted_before.setdefault(op.id, todo_count_key(todo))
+
+        for key, value in _with_reminder_reset(values).items():
+            setattr(todo, key, value)
+        todo.updated_at = now
+        todo.client_updated_at = client_updated_at
+        if not REMINDER_COLUMNS.isdisjoint(values):
+            reminders_touched.add(op.id)
+
+        result.update(status="applied", todo=TodoResponse.model_validate(todo))
+
+    apply_todo_count_deltas(db, user_id, count_deltas(
+        (before, todo_count_key(existing[todo_id])) for todo_id, before in counted_before.items()
+    ))
+    for todo_id in reminders_touched:
+        track_reminder_changes(db, [todo_id], pending=_has_pending_reminder(existing[todo_id]))
+    return results
@@ -1,14 +1,24 @@
 import uuid
 from sqlalchemy.orm import Session
 from app.models.user_model import UserModel
-from app.core.security import hash_password
+from app.models.todo_model import TodoModel
+from app.models.refresh_token_model import RefreshTokenModel
+from app.database.todo_counter_crud import delete_user_todo_counts
 
-def create_user(db: Session, email: str, password: str, name: str | None = None):
-    user = UserModel(id=str(uuid.uuid4()), email=email, hashed_password=hash_password(password), name=name)
+def create_user(db: Session, email: str, hashed_password: str, name: str | None = None):
+    user = UserModel(id=str(uuid.uuid4()), email=email, hashed_password=hashed_password, name=name)
     db.add(user)
     db.commit()
     db.refresh(user)
     return user
 
 def get_user_by_email(db: Session, email: str):
-    return db.query(UserModel).filter(UserModel.email == email).first()
\ No newline at end of file
+    return db.query(UserModel).filter(UserModel.email == email).first()
+
+def delete_user_account(db: Session, user_id: str) -> tuple[int, int]:
+    # Hard delete todos and refresh tokens, then the user; returns both counts
+    todos_count = db.query(TodoModel).filter(TodoModel.user_id == user_id).delete()
+    delete_user_todo_counts(db, user_id)
+    tokens_count = db.query(RefreshTokenModel).filter(RefreshTokenModel.user_id == user_id).delete()
+    db.query(UserModel).filter(UserModel.id == user_id).delete()
+    return todos_count, tokens_count
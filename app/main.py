@@ -1,21 +1,56 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from app.api.v1.endpoints import metrics_endpoint
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.middleware.content_negotiation import ContentNegotiationMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.sql_timing import SQLTimingMiddleware
+from app.services.reminder_scheduler import reminder_scheduler
+from app.services.token_sweeper import refresh_token_sweeper
 from app.utils.logger import logger
 from app.utils.response import (
+    FastJSONResponse,
     server_error_response,
     validation_error_response,
     ErrorCode
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services with the app and stop them on shutdown"""
+    refresh_token_sweeper.start()
+    reminder_scheduler.start()
+    yield
+    await reminder_scheduler.stop()
+    await refresh_token_sweeper.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="Flow Todo Backend API with standardized responses"
+    description="Flow Todo Backend API with standardized responses",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
+# Last added runs first: time everything, profile, count SQL, negotiate the format, then throttle
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+app.add_middleware(ContentNegotiationMiddleware)
+if settings.SQL_TIMING_ENABLED:
+    app.add_middleware(SQLTimingMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -49,6 +84,9 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         403: ErrorCode.FORBIDDEN,
         404: ErrorCode.NOT_FOUND,
         409: ErrorCode.CONFLICT,
+        415: ErrorCode.VALIDATION_ERROR,
+        429: ErrorCode.RATE_LIMITED,
+        503: ErrorCode.SERVICE_UNAVAILABLE,
     }
     
     error_code = status_to_code.get(exc.status_code, ErrorCode.SERVER_ERROR)
@@ -71,4 +109,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+if settings.METRICS_ENABLED:
+    # Scraped at the conventional root path, outside the versioned API
+    app.include_router(metrics_endpoint.router)
 
@@ -0,0 +1,32 @@
+"""
+Per-request response format selection from the Accept header.
+"""
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.content_negotiation import JSON, MSGPACK, prefers_msgpack, response_format
+
+
+class ContentNegotiationMiddleware:
+    """
+    Record the negotiated wire format in `response_format` for the request.
+
+    Envelope responses read it when they are built, so each body is encoded
+    once, directly in the requested format. Exception handler responses are
+    covered too, since they run inside this middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = Headers(scope=scope).get("accept")
+        token = response_format.set(MSGPACK if prefers_msgpack(accept) else JSON)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            response_format.reset(token)
@@ -0,0 +1,56 @@
+"""
+Request counting and timing for /metrics.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import RequestMetrics, request_metrics
+from app.utils.routing import match_route_template
+
+# Label for requests that matched no route, so unknown paths can't add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, e.g. /api/v1/todos/{todo_id}."""
+    route = scope.get("route")
+    if route is not None and scope.get("endpoint") is not None:
+        # Newer FastAPI releases resolve included routers per request and
+        # leave the route its unprefixed path; the prefixed one is on the
+        # route context
+        context = scope.get("fastapi", {}).get("effective_route_context")
+        return getattr(context, "path", None) or route.path
+    # Answered before routing (e.g. throttled): match the route table
+    return match_route_template(scope) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Record every HTTP request's status and latency under its route template,
+    so series stay bounded by the route table rather than by URLs.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.started()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.observe(scope["method"], route_template(scope), status, time.perf_counter() - start)
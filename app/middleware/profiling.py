@@ -0,0 +1,88 @@
+"""
+Opt-in cProfile capture of individual requests.
+"""
+import cProfile
+import hmac
+import os
+import random
+import re
+import time
+import uuid
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Profile a request with cProfile when it sends `X-Profile: <secret>`
+    matching PROFILING_SECRET, or when it is picked by PROFILING_SAMPLE_RATE.
+
+    Stats are written as a .prof file (load with pstats or snakeviz) to
+    PROFILING_DIR and its name is returned in the X-Profile response header.
+    cProfile sees the event loop thread, so work handed to the threadpool
+    is not included, and coroutines of concurrent requests may be. Only one
+    request is profiled at a time; others run unprofiled meanwhile.
+
+    main.py installs this only when PROFILING_ENABLED is set. Tests can wrap
+    the app directly: TestClient(ProfilingMiddleware(app, secret=..., output_dir=...)).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret: Optional[str] = None,
+        sample_rate: Optional[float] = None,
+        output_dir: Optional[str] = None,
+    ):
+        self.app = app
+        self.secret = settings.PROFILING_SECRET if secret is None else secret
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.output_dir = settings.PROFILING_DIR if output_dir is None else output_dir
+        self._active = False
+
+    def _wants_profile(self, scope: Scope) -> bool:
+        if self.secret:
+            presented = Headers(scope=scope).get(PROFILE_HEADER)
+            if presented and hmac.compare_digest(presented.encode(), self.secret.encode()):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _profile_path(self, scope: Scope) -> str:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+        return os.path.join(self.output_dir, name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        path = self._profile_path(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile"] = os.path.basename(path)
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+        finally:
+            self._active = False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        await run_in_threadpool(profiler.dump_stats, path)
+        logger.info(f"Profiled {scope['method']} {scope['path']} -> {path}")
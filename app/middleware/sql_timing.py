@@ -0,0 +1,55 @@
+"""
+Per-request SQL query count and time, reported as Server-Timing.
+"""
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.database.instrumentation import QueryStats, current_query_stats, install_query_instrumentation
+from app.utils.logger import logger
+
+
+class SQLTimingMiddleware:
+    """
+    Collect the SQL statements run while serving a request.
+
+    The response carries `Server-Timing: db;dur=<ms>;desc="<n> queries",
+    app;dur=<ms>` as of when headers are sent. With QUERY_COUNT_WARN_THRESHOLD
+    set, requests running more statements than that are logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        install_query_instrumentation()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.milliseconds:.2f};desc="{stats.count} queries", app;dur={elapsed_ms:.2f}'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            limit = settings.QUERY_COUNT_WARN_THRESHOLD
+            if limit > 0 and stats.count > limit:
+                logger.warning(
+                    f"{scope['method']} {scope['path']} ran {stats.count} queries "
+                    f"({stats.milliseconds:.1f} ms), over the limit of {limit}"
+                )
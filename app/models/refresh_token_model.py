@@ -19,11 +19,11 @@ class RefreshTokenModel(Base):
     __tablename__ = "refresh_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, ForeignKey("users.id"))
+    user_id = Column(String, ForeignKey("users.id"), index=True)  # logout-all
     token = Column(String, unique=True, index=True)
     user_agent = Column(String, nullable=True)
 
     created_at = Column(DateTime(timezone=True), default=utcnow)
-    expires_at = Column(DateTime(timezone=True), default=refresh_expiry)
+    expires_at = Column(DateTime(timezone=True), default=refresh_expiry, index=True)  # expiry sweeper
 
     user = relationship("UserModel")
@@ -0,0 +1,13 @@
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from app.database.session import Base
+
+
+class TodoCounterModel(Base):
+    """Number of a user's live todos per (is_completed, priority) bucket."""
+
+    __tablename__ = "todo_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    is_completed = Column(Boolean, primary_key=True)
+    priority = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
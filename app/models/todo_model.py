@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Boolean, DateTime
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, String, Boolean, DateTime, and_, event
 from sqlalchemy.sql import func
 from app.database.session import Base
 from sqlalchemy.orm import relationship
@@ -13,10 +13,117 @@ class TodoModel(Base):
     is_completed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Client-side modification time of the last edit applied through sync;
+    # cleared by server-side edits, whose time is updated_at
+    client_updated_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     reminder_at = Column(DateTime(timezone=True), nullable=True)
+    # Set when the reminder is dispatched, cleared when reminder_at changes
+    reminder_sent_at = Column(DateTime(timezone=True), nullable=True)
     is_deleted = Column(Boolean, default=False)
     is_synced = Column(Boolean, default=False)
     user_id = Column(String, ForeignKey("users.id"))  # associate with user
 
     user = relationship("UserModel", back_populates="todos")
+
+    __table_args__ = (
+        # Serves the keyset-paginated list: equality on user/is_deleted,
+        # then (updated_at, id) in index order.
+        Index(
+            "ix_todos_user_id_is_deleted_updated_at_id",
+            "user_id",
+            "is_deleted",
+            "updated_at",
+            "id",
+        ),
+        # Serves the change feed, which includes soft-deleted rows.
+        Index("ix_todos_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
+
+
+def pending_reminder_criteria():
+    """Todos with a reminder still to send; matches ix_todos_pending_reminder_at."""
+    return and_(
+        TodoModel.reminder_at.is_not(None),
+        TodoModel.reminder_sent_at.is_(None),
+        TodoModel.is_completed == False,
+        TodoModel.is_deleted == False,
+    )
+
+
+# Serves the reminder scheduler's due window. Only reminders still to send
+# are indexed, so the index stays small and its range scans never visit
+# completed, deleted or already reminded todos.
+Index(
+    "ix_todos_pending_reminder_at",
+    TodoModel.reminder_at,
+    sqlite_where=pending_reminder_criteria(),
+    postgresql_where=pending_reminder_criteria(),
+)
+
+
+# Full-text search over title/description. The index is maintained by the
+# database itself, so ORM writes, bulk INSERT/UPDATE and sync all keep it
+# current. See todo_crud.search_todos.
+#
+# SQLite: an external-content FTS5 table over a view of todos. user_key is
+# the user id without hyphens, indexed as a column so a user's matches are
+# selected inside FTS5. The index is keyed on todos' implicit rowid, which
+# VACUUM may renumber: run INSERT INTO todos_fts(todos_fts) VALUES('rebuild')
+# after a VACUUM.
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIEW IF NOT EXISTS todos_fts_source AS
+    SELECT rowid, title, description, replace(user_id, '-', '') AS user_key FROM todos
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5(
+        title, description, user_key,
+        content='todos_fts_source', content_rowid='rowid', prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN
+        INSERT INTO todos_fts(rowid, title, description, user_key)
+        VALUES (new.rowid, new.title, new.description, replace(new.user_id, '-', ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description, user_key)
+        VALUES ('delete', old.rowid, old.title, old.description, replace(old.user_id, '-', ''));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title, description, user_id ON todos BEGIN
+        INSERT INTO todos_fts(todos_fts, rowid, title, description, user_key)
+        VALUES ('delete', old.rowid, old.title, old.description, replace(old.user_id, '-', ''));
+        INSERT INTO todos_fts(rowid, title, description, user_key)
+        VALUES (new.rowid, new.title, new.description, replace(new.user_id, '-', ''));
+    END
+    """,
+]
+# Dropping todos drops its triggers, but not the view or the FTS table
+SQLITE_SEARCH_DROP_DDL = [
+    "DROP TABLE IF EXISTS todos_fts",
+    "DROP VIEW IF EXISTS todos_fts_source",
+]
+
+# PostgreSQL: a generated tsvector (title weighted above description) with a
+# GIN index.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE todos ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_todos_search_vector ON todos USING GIN (search_vector)",
+]
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(TodoModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in SQLITE_SEARCH_DROP_DDL:
+    event.listen(TodoModel.__table__, "after_drop", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(TodoModel.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,6 +1,8 @@
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Literal, Optional, List
+from pydantic import BaseModel, Field, field_validator
+
+from app.utils.timezone_helper import to_utc
 
 
 class TodoBase(BaseModel):
@@ -14,7 +16,12 @@ class TodoBase(BaseModel):
 
 
 class TodoCreate(TodoBase):
-    pass
+    @field_validator("reminder_at")
+    @classmethod
+    def reminder_in_utc(cls, value):
+        # Reminders are compared with the scheduler's UTC clock, and SQLite
+        # drops the offset when storing
+        return to_utc(value) if value is not None else None
 
 
 class TodoUpdate(BaseModel):
@@ -27,6 +34,19 @@ class TodoUpdate(BaseModel):
     is_synced: Optional[bool] = Field(default=None, alias="isSynced")
     completed_at: Optional[datetime] = Field(default=None, alias="completedAt")
 
+    @field_validator("title", "is_completed", "priority", "is_deleted", "is_synced")
+    @classmethod
+    def not_null(cls, value):
+        # Omitted fields are left alone; an explicit null would be written
+        if value is None:
+            raise ValueError("Field may be omitted but cannot be null")
+        return value
+
+    @field_validator("reminder_at")
+    @classmethod
+    def reminder_in_utc(cls, value):
+        return to_utc(value) if value is not None else None
+
 
 class TodoResponse(TodoBase):
     id: str
@@ -40,10 +60,74 @@ class TodoResponse(TodoBase):
     }
 
 
+class TodoExport(TodoCreate):
+    """
+    One line of an NDJSON export, and of an import.
+
+    Exports are written with field names. Imports accept field names or
+    the camelCase aliases, so an export imports as is. The server-assigned
+    fields are optional; imported todos get new ones.
+    """
+    id: Optional[str] = None
+    created_at: Optional[datetime] = Field(default=None, alias="createdAt")
+    updated_at: Optional[datetime] = Field(default=None, alias="updatedAt")
+    completed_at: Optional[datetime] = Field(default=None, alias="completedAt")
+
+    model_config = {
+        "from_attributes": True,
+        "populate_by_name": True,
+        "extra": "forbid",
+    }
+
+
+class PriorityCounts(BaseModel):
+    priority: int
+    open: int = 0
+    completed: int = 0
+
+
+class TodoStats(BaseModel):
+    total: int = 0
+    open: int = 0
+    completed: int = 0
+    by_priority: List[PriorityCounts]
+
+
+class TodoReminder(BaseModel):
+    """A due reminder handed to a reminder sink."""
+    todo_id: str
+    user_id: str
+    title: str
+    reminder_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 class BulkTodoCreate(BaseModel):
-    todos: List[TodoCreate]
+    # Items are validated as TodoCreate one by one so failures are reported per index
+    todos: List[Dict[str, Any]]
+
+
+class BulkTodoUpdate(BaseModel):
+    ids: List[str]
+    changes: TodoUpdate
+
+
+class BulkTodoDelete(BaseModel):
+    ids: List[str]
 
 
 class BulkTodoResponse(BaseModel):
     created: List[TodoResponse]
     failed: List[dict]  # List of {index: int, error: str}
+
+
+class TodoSyncOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: str = Field(description="Client-generated todo UUID")
+    updated_at: datetime = Field(alias="updatedAt", description="Client-side modification time")
+    data: Optional[Dict[str, Any]] = None  # TodoCreate for create, TodoUpdate for update
+
+
+class TodoSyncRequest(BaseModel):
+    operations: List[TodoSyncOperation]
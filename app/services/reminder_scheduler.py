@@ -0,0 +1,265 @@
+"""
+Dispatch of todo reminders when their reminder_at comes due.
+"""
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Protocol, Tuple
+
+from app.core.config import settings
+from app.database.reminder_crud import (
+    add_reminder_change_listener,
+    claim_due_reminders,
+    get_pending_reminders,
+    list_pending_reminders,
+    remove_reminder_change_listener,
+)
+from app.database.session import DbSession, db_session, run_db, run_db_transaction
+from app.schemas.todo_schema import TodoReminder
+from app.utils.logger import logger
+
+# Seconds to wait before retrying after a failed reload or dispatch
+RETRY_DELAY = 5.0
+
+
+class ReminderSink(Protocol):
+    """Where due reminders are delivered; `send` may block for backpressure."""
+
+    async def send(self, reminder: TodoReminder) -> None: ...
+
+
+class LoggingSink:
+    """Log each due reminder; the default until a delivery channel exists."""
+
+    async def send(self, reminder: TodoReminder) -> None:
+        logger.info(
+            f"Reminder due for todo {reminder.todo_id} (user {reminder.user_id}) "
+            f"at {reminder.reminder_at.isoformat()}"
+        )
+
+
+class QueueSink:
+    """Hand due reminders to an in-process consumer through a bounded queue."""
+
+    def __init__(self, maxsize: int):
+        self.queue: "asyncio.Queue[TodoReminder]" = asyncio.Queue(maxsize)
+
+    async def send(self, reminder: TodoReminder) -> None:
+        await self.queue.put(reminder)
+
+
+def build_sink(name: str, queue_size: int) -> ReminderSink:
+    if name == "log":
+        return LoggingSink()
+    if name == "queue":
+        return QueueSink(queue_size)
+    raise ValueError(f"Unknown reminder sink {name!r}; expected 'log' or 'queue'")
+
+
+class ReminderScheduler:
+    """
+    Hold the reminders due within the next `window` seconds in a min-heap
+    and send each one to the sink when it comes due.
+
+    The window is loaded with a range scan of the partial index on
+    pending reminders, at most `max_pending` at a time; when truncated,
+    the window ends at the last reminder loaded. It is reloaded every
+    `reload_interval` seconds, or sooner when it runs out. In between,
+    todo writes committed by this process are applied incrementally
+    (writes from other processes are picked up by the next reload).
+
+    Heap entries are hints: each is claimed with a conditional UPDATE
+    that marks it sent only if it is still pending and due, so stale
+    entries and other workers' claims are skipped. A reminder is claimed
+    before it is sent, i.e. delivered at most once.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        max_pending: int,
+        reload_interval: float,
+        batch_size: int,
+        sink: ReminderSink,
+        enabled: bool = True,
+        session_factory: Callable[[], AsyncContextManager[DbSession]] = db_session,
+    ):
+        self.window = window
+        self.max_pending = max_pending
+        self.reload_interval = min(reload_interval, window)
+        self.batch_size = batch_size
+        self.sink = sink
+        self.enabled = enabled
+        self.session_factory = session_factory
+        self.reloads = 0
+        self.dispatched = 0
+        self.last_reload_at: Optional[datetime] = None
+        # todo id -> reminder_at it is scheduled for; heap entries not
+        # matching it are stale and skipped when popped
+        self._scheduled: Dict[str, datetime] = {}
+        self._heap: List[Tuple[datetime, str]] = []
+        self._horizon: Optional[datetime] = None
+        self._next_reload: Optional[datetime] = None
+        # Committed changes not yet applied: todo id -> needs a lookup
+        self._changed: Dict[str, bool] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _schedule(self, reminder_at: datetime, todo_id: str) -> None:
+        if self._scheduled.get(todo_id) == reminder_at:
+            return
+        self._scheduled[todo_id] = reminder_at
+        heapq.heappush(self._heap, (reminder_at, todo_id))
+
+    async def reload(self, now: Optional[datetime] = None) -> int:
+        """Replace the heap with the pending reminders of the next window."""
+        now = now or datetime.now(timezone.utc)
+        until = now + timedelta(seconds=self.window)
+        # Changes committed from here on may be missed by the query
+        self._changed = {}
+        async with self.session_factory() as db:
+            rows = await run_db(db, list_pending_reminders, until, self.max_pending)
+
+        self._scheduled = {todo_id: reminder_at for reminder_at, todo_id in rows}
+        self._heap = [(reminder_at, todo_id) for todo_id, reminder_at in self._scheduled.items()]
+        heapq.heapify(self._heap)
+        self._horizon = rows[-1][0] if len(rows) >= self.max_pending else until
+        self._next_reload = min(now + timedelta(seconds=self.reload_interval), self._horizon)
+        self.reloads += 1
+        self.last_reload_at = now
+        return len(rows)
+
+    async def apply_changes(self) -> None:
+        """Reschedule or drop the todos changed since the last call."""
+        if self._horizon is None:
+            return
+        changes, self._changed = self._changed, {}
+        lookup = []
+        for todo_id, pending in changes.items():
+            self._scheduled.pop(todo_id, None)
+            if pending:
+                lookup.append(todo_id)
+
+        if lookup:
+            async with self.session_factory() as db:
+                rows = await run_db(db, get_pending_reminders, lookup)
+            for reminder_at, todo_id in rows:
+                if reminder_at <= self._horizon:
+                    self._schedule(reminder_at, todo_id)
+
+        if len(self._scheduled) > self.max_pending:
+            # Shrink the window back to max_pending on the next tick
+            self._next_reload = None
+        elif len(self._heap) > 2 * len(self._scheduled) + self.batch_size:
+            self._heap = [(reminder_at, todo_id) for todo_id, reminder_at in self._scheduled.items()]
+            heapq.heapify(self._heap)
+
+    async def dispatch_due(self, now: Optional[datetime] = None) -> int:
+        """Claim and send every scheduled reminder due by `now`."""
+        now = now or datetime.now(timezone.utc)
+        sent = 0
+        while self._heap and self._heap[0][0] <= now:
+            batch = []
+            while self._heap and self._heap[0][0] <= now and len(batch) < self.batch_size:
+                reminder_at, todo_id = heapq.heappop(self._heap)
+                if self._scheduled.get(todo_id) == reminder_at:
+                    del self._scheduled[todo_id]
+                    batch.append(todo_id)
+            if not batch:
+                continue
+
+            async with self.session_factory() as db:
+                reminders = await run_db_transaction(db, claim_due_reminders, batch, now)
+            for reminder in reminders:
+                try:
+                    await self.sink.send(reminder)
+                except Exception as e:
+                    logger.error(f"Sending reminder for todo {reminder.todo_id} failed: {e}", exc_info=True)
+            sent += len(reminders)
+
+        self.dispatched += sent
+        return sent
+
+    async def tick(self, now: Optional[datetime] = None) -> int:
+        """Reload if due, apply pending changes and dispatch due reminders."""
+        now = now or datetime.now(timezone.utc)
+        if self._next_reload is None or now >= self._next_reload:
+            await self.reload(now)
+        if self._changed:
+            await self.apply_changes()
+        return await self.dispatch_due(now)
+
+    def _seconds_until_next(self) -> float:
+        if self._next_reload is None:
+            return RETRY_DELAY
+        wake_at = self._next_reload
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        return max(0.0, (wake_at - datetime.now(timezone.utc)).total_seconds())
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Reminder scheduler tick failed: {e}", exc_info=True)
+                # Changes may have been lost with the failed tick
+                self._next_reload = None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._seconds_until_next())
+            except asyncio.TimeoutError:
+                pass
+
+    def _merge_changes(self, changes: Dict[str, bool]) -> None:
+        # Commits may be reported out of order, so a lookup always wins
+        for todo_id, pending in changes.items():
+            self._changed[todo_id] = self._changed.get(todo_id, False) or pending
+        self._wakeup.set()
+
+    def notify(self, changes: Dict[str, bool]) -> None:
+        """Reminder change listener; called after commit, from any thread."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._merge_changes, dict(changes))
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._next_reload = None
+            add_reminder_change_listener(self.notify)
+            self._task = asyncio.create_task(self._run(), name="reminder-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        remove_reminder_change_listener(self.notify)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "scheduled": len(self._scheduled),
+            "horizon": self._horizon.isoformat() if self._horizon else None,
+            "reloads": self.reloads,
+            "dispatched": self.dispatched,
+            "last_reload_at": self.last_reload_at.isoformat() if self.last_reload_at else None,
+        }
+
+
+reminder_scheduler = ReminderScheduler(
+    window=settings.REMINDER_WINDOW_SECONDS,
+    max_pending=settings.REMINDER_MAX_PENDING,
+    reload_interval=settings.REMINDER_RELOAD_INTERVAL_SECONDS,
+    batch_size=settings.REMINDER_DISPATCH_BATCH_SIZE,
+    sink=build_sink(settings.REMINDER_SINK, settings.REMINDER_QUEUE_SIZE),
+    enabled=settings.REMINDER_SCHEDULER_ENABLED,
+)
@@ -0,0 +1,97 @@
+"""
+Background purge of expired refresh tokens.
+"""
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, AsyncContextManager, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.database.refresh_token_crud import delete_expired_refresh_tokens
+from app.database.session import DbSession, db_session, run_db_transaction
+from app.utils.logger import logger
+
+
+class RefreshTokenSweeper:
+    """
+    Periodically delete expired refresh tokens in bounded batches.
+
+    Each batch is its own short transaction, and a run stops after
+    `max_batches` so a large backlog is worked off over several intervals
+    instead of holding the database for one long purge.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        batch_size: int,
+        max_batches: int,
+        session_factory: Callable[[], AsyncContextManager[DbSession]] = db_session,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.session_factory = session_factory
+        self.runs = 0
+        self.deleted = 0
+        self.last_run_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        """Delete expired tokens now; returns how many were removed."""
+        now = datetime.now(timezone.utc)
+        total = 0
+
+        async with self.session_factory() as db:
+            for _ in range(self.max_batches):
+                deleted = await run_db_transaction(
+                    db, delete_expired_refresh_tokens, now, self.batch_size
+                )
+                total += deleted
+                if deleted < self.batch_size:
+                    break
+                # Let request handlers in between batches
+                await asyncio.sleep(0)
+
+        self.runs += 1
+        self.deleted += total
+        self.last_run_at = now
+        if total:
+            logger.info(f"Refresh token sweeper deleted {total} expired tokens")
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Refresh token sweep failed: {e}", exc_info=True)
+
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="refresh-token-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "runs": self.runs,
+            "deleted": self.deleted,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+refresh_token_sweeper = RefreshTokenSweeper(
+    interval=settings.REFRESH_TOKEN_SWEEP_INTERVAL_SECONDS,
+    batch_size=settings.REFRESH_TOKEN_SWEEP_BATCH_SIZE,
+    max_batches=settings.REFRESH_TOKEN_SWEEP_MAX_BATCHES,
+)
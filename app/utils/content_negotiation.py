@@ -0,0 +1,97 @@
+"""
+MessagePack content negotiation.
+
+`Accept: application/msgpack` selects a MessagePack encoding of the usual
+response envelope, and `Content-Type: application/msgpack` request bodies
+are accepted on routes using `MsgPackRoute`. msgpack is an optional
+dependency; without it every response is JSON and MessagePack bodies are
+rejected with 415.
+"""
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+# Wire format negotiated for the current request; set by ContentNegotiationMiddleware
+response_format: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def prefers_msgpack(accept: Optional[str]) -> bool:
+    """Whether an Accept header asks for MessagePack (and it's available)."""
+    if not accept or msgpack is None:
+        return False
+
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        if media_type.strip().lower() not in MSGPACK_MEDIA_TYPES:
+            continue
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def is_msgpack_content_type(content_type: Optional[str]) -> bool:
+    return bool(content_type) and _media_type(content_type) in MSGPACK_MEDIA_TYPES
+
+
+def packb(data: Any) -> bytes:
+    return msgpack.packb(data)
+
+
+class MsgPackRequest(Request):
+    """Request whose body is MessagePack; `json()` returns the decoded body."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            try:
+                self._json = msgpack.unpackb(await self.body())
+            except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError):
+                raise HTTPException(status_code=400, detail="Invalid MessagePack body")
+        return self._json
+
+
+class MsgPackRoute(APIRoute):
+    """APIRoute whose body parameters may also be sent as MessagePack."""
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack_content_type(request.headers.get("content-type")):
+                if msgpack is None:
+                    raise HTTPException(status_code=415, detail="MessagePack bodies are not supported")
+                # FastAPI only parses JSON content types into body models, so
+                # present the body as JSON and decode it in MsgPackRequest.json
+                headers = [
+                    (name, b"application/json" if name == b"content-type" else value)
+                    for name, value in request.scope["headers"]
+                ]
+                request = MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+            return await handler(request)
+
+        return route_handler
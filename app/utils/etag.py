@@ -0,0 +1,64 @@
+"""
+Strong ETags and conditional GET helpers.
+
+ETags are derived from cheap version queries (``updated_at`` values and row
+counts), so a matching ``If-None-Match`` is answered with 304 before any row
+is loaded or serialized.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi.responses import Response
+
+from app.utils.content_negotiation import msgpack_available, response_format
+
+# Clients must revalidate, and shared caches must not store per-user data
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a quoted strong ETag from the string forms of `parts`.
+
+    The negotiated wire format is included, since JSON and MessagePack
+    bodies are different representations.
+    """
+    raw = "|".join("" if part is None else str(part) for part in (response_format.get(), *parts))
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches `etag`.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/ prefix added by a proxy still matches.
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified_headers(etag: str) -> dict:
+    headers = etag_headers(etag)
+    if msgpack_available():
+        headers["Vary"] = "Accept"
+    return headers
+
+
+def not_modified_response(etag: str) -> Response:
+    """Empty 304 carrying the validator the client already has."""
+    return Response(status_code=304, headers=not_modified_headers(etag))
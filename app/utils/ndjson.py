@@ -0,0 +1,41 @@
+"""
+Incremental NDJSON parsing for streamed request bodies.
+"""
+from typing import AsyncIterator, Optional
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[Optional[bytes]]:
+    """
+    Yield the lines of a byte stream without buffering more than one line.
+
+    A line longer than `max_line_bytes` is discarded as it arrives and
+    reported as None, so callers can count it as a failed line.
+    """
+    # Pieces of the current, unterminated line
+    partial = []
+    partial_len = 0
+    oversized = False
+
+    async for chunk in chunks:
+        # One split per chunk: each byte is copied once, however many lines it holds
+        *complete, tail = chunk.split(b"\n")
+        for piece in complete:
+            if oversized or partial_len + len(piece) > max_line_bytes:
+                yield None
+            else:
+                yield b"".join(partial) + piece if partial else piece
+            partial, partial_len, oversized = [], 0, False
+
+        if tail and not oversized:
+            partial_len += len(tail)
+            if partial_len > max_line_bytes:
+                partial, partial_len, oversized = [], 0, True
+            else:
+                partial.append(tail)
+
+    if oversized:
+        yield None
+    elif partial:
+        yield b"".join(partial)
@@ -0,0 +1,75 @@
+"""
+Opaque keyset cursors for paginated endpoints.
+
+A cursor encodes the ``(updated_at, id)`` pair of the last row on a page with
+microsecond precision, so rows sharing the same timestamp are neither skipped
+nor repeated across pages. Search cursors encode the ``(tier, id)`` of the
+last result instead.
+"""
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+
+from app.utils.timezone_helper import make_aware
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+
+
+def encode_cursor(updated_at: datetime, item_id: str) -> str:
+    """Encode a ``(updated_at, id)`` keyset position as an opaque string."""
+    micros = (make_aware(updated_at) - EPOCH) // ONE_MICROSECOND
+    return _encode(f"{micros}:{item_id}")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    An empty id is the position before every row stamped ``updated_at``,
+    as used by sync watermarks.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        micros, item_id = _decode(cursor).split(":", 1)
+        updated_at = EPOCH + timedelta(microseconds=int(micros))
+    except (binascii.Error, UnicodeError, ValueError, OverflowError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    return updated_at, item_id
+
+
+def encode_search_cursor(tier: int, item_id: str) -> str:
+    """Encode a ``(tier, id)`` search position as an opaque string."""
+    return _encode(f"{tier}:{item_id}")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Decode a cursor produced by ``encode_search_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        tier, item_id = _decode(cursor).split(":", 1)
+        tier = int(tier)
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if tier not in (0, 1) or not item_id:
+        raise ValueError("Invalid cursor")
+
+    return tier, item_id
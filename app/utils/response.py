@@ -3,8 +3,17 @@ Standardized API response utilities.
 Implements the API specification for consistent response formatting.
 """
 from typing import Any, Optional, Dict
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_json
+
+from app.utils.content_negotiation import (
+    MSGPACK,
+    MSGPACK_MEDIA_TYPE,
+    msgpack_available,
+    packb,
+    response_format,
+)
 
 
 class SuccessResponse(BaseModel):
@@ -23,6 +32,45 @@ class ErrorResponse(BaseModel):
     details: Optional[Dict[str, Any]] = None
 
 
+# Serializers built once; envelopes go straight to JSON bytes in pydantic-core
+_ENVELOPE_ADAPTERS = {
+    SuccessResponse: TypeAdapter(SuccessResponse),
+    ErrorResponse: TypeAdapter(ErrorResponse),
+}
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core instead of the stdlib json module"""
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class EnvelopeResponse(Response):
+    """
+    Response for a SuccessResponse/ErrorResponse envelope.
+
+    The envelope is serialized once, with None values dropped, straight to
+    bytes; there is no intermediate model_dump or second json encode. When
+    the request negotiated MessagePack, the same envelope is packed instead.
+    """
+    media_type = "application/json"
+
+    def __init__(self, envelope: BaseModel, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+        self.envelope = envelope
+        if response_format.get() == MSGPACK:
+            self.media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content=envelope, status_code=status_code, headers=headers)
+        if msgpack_available():
+            self.headers.append("Vary", "Accept")
+
+    def render(self, content: Any) -> bytes:
+        adapter = _ENVELOPE_ADAPTERS[type(content)]
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return packb(adapter.dump_python(content, mode="json", exclude_none=True))
+        return adapter.dump_json(content, exclude_none=True)
+
+
 # Error codes
 class ErrorCode:
     """Standard error codes"""
@@ -38,14 +86,17 @@ class ErrorCode:
     TOKEN_EXPIRED = "TOKEN_EXPIRED"
     TODO_NOT_FOUND = "TODO_NOT_FOUND"
     USER_NOT_FOUND = "USER_NOT_FOUND"
+    SERVICE_UNAVAILABLE = "SERVICE_UNAVAILABLE"
+    RATE_LIMITED = "RATE_LIMITED"
 
 
 def success_response(
     data: Any = None,
     message: Optional[str] = None,
     meta: Optional[Dict[str, Any]] = None,
-    status_code: int = 200
-) -> JSONResponse:
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> EnvelopeResponse:
     """
     Create a standardized success response.
     
@@ -54,20 +105,19 @@ def success_response(
         message: Optional success message
         meta: Optional metadata (pagination, sync info, etc.)
         status_code: HTTP status code
+        headers: Optional extra response headers (e.g. ETag)
     
     Returns:
-        JSONResponse with standardized format
+        EnvelopeResponse with standardized format
     """
-    response = SuccessResponse(
+    # Every field accepts Any/None, so validation is skipped
+    response = SuccessResponse.model_construct(
         success=True,
         message=message,
         data=data,
         meta=meta
     )
-    return JSONResponse(
-        status_code=status_code,
-        content=response.model_dump(mode='json', exclude_none=True)
-    )
+    return EnvelopeResponse(response, status_code=status_code, headers=headers)
 
 
 def error_response(
@@ -75,7 +125,7 @@ def error_response(
     error_code: str,
     details: Optional[Dict[str, Any]] = None,
     status_code: int = 400
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """
     Create a standardized error response.
     
@@ -86,7 +136,7 @@ def error_response(
         status_code: HTTP status code
     
     Returns:
-        JSONResponse with standardized error format
+        EnvelopeResponse with standardized error format
     """
     response = ErrorResponse(
         success=False,
@@ -94,16 +144,13 @@ def error_response(
         error_code=error_code,
         details=details
     )
-    return JSONResponse(
-        status_code=status_code,
-        content=response.model_dump(mode='json', exclude_none=True)
-    )
+    return EnvelopeResponse(response, status_code=status_code)
 
 
 def validation_error_response(
     message: str = "Invalid data format",
     details: Optional[Dict[str, Any]] = None
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """Create a validation error response (400)"""
     return error_response(
         message=message,
@@ -116,7 +163,7 @@ def validation_error_response(
 def unauthorized_response(
     message: str = "Invalid or expired token",
     error_code: str = ErrorCode.UNAUTHORIZED
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """Create an unauthorized error response (401)"""
     return error_response(
         message=message,
@@ -128,7 +175,7 @@ def unauthorized_response(
 def forbidden_response(
     message: str = "Access denied",
     details: Optional[Dict[str, Any]] = None
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """Create a forbidden error response (403)"""
     return error_response(
         message=message,
@@ -142,7 +189,7 @@ def not_found_response(
     message: str = "Resource not found",
     error_code: str = ErrorCode.NOT_FOUND,
     details: Optional[Dict[str, Any]] = None
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """Create a not found error response (404)"""
     return error_response(
         message=message,
@@ -155,7 +202,7 @@ def not_found_response(
 def conflict_response(
     message: str = "Version conflict",
     details: Optional[Dict[str, Any]] = None
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """Create a conflict error response (409)"""
     return error_response(
         message=message,
@@ -167,7 +214,7 @@ def conflict_response(
 
 def server_error_response(
     message: str = "Internal server error"
-) -> JSONResponse:
+) -> EnvelopeResponse:
     """Create a server error response (500)"""
     return error_response(
         message=message,
@@ -175,3 +222,10 @@ def server_error_response(
         status_code=500
     )
 
+
+def format_validation_error(exc: ValidationError) -> str:
+    """Flatten a Pydantic validation error into a single readable line"""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in error.get('loc', [])) or 'body'}: {error.get('msg')}"
+        for error in exc.errors()
+    )
@@ -0,0 +1,63 @@
+"""
+Route templates for requests that haven't been routed yet.
+
+Middleware running in front of the router (e.g. rate limiting) sees only
+the raw path. It matches it against the application's route table here
+to find the template, e.g. /api/v1/todos/{todo_id}, that routing would
+select. The table is built from the app's routes on first use.
+"""
+from typing import Iterator, List, Optional, Pattern, Set, Tuple
+from weakref import WeakKeyDictionary
+
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Scope
+
+RouteEntry = Tuple[Pattern, Optional[Set[str]], str]
+
+_route_tables: "WeakKeyDictionary[ASGIApp, List[RouteEntry]]" = WeakKeyDictionary()
+
+
+def _iter_routes(app) -> Iterator:
+    routes = app.router.routes
+    try:
+        # Newer FastAPI releases resolve included routers per request; the
+        # prefixed paths are on their route contexts
+        from fastapi.routing import iter_route_contexts
+    except ImportError:
+        return iter(routes)
+    return iter_route_contexts(routes)
+
+
+def _route_table(app) -> List[RouteEntry]:
+    table = _route_tables.get(app)
+    if table is None:
+        table = []
+        for route in _iter_routes(app):
+            path = getattr(route, "path", None)
+            # Only HTTP endpoints; mounts and websockets aren't templated
+            if path is None or getattr(route, "endpoint", None) is None or not hasattr(route, "methods"):
+                continue
+            regex, _, _ = compile_path(path)
+            table.append((regex, route.methods, path))
+        _route_tables[app] = table
+    return table
+
+
+def match_route_template(scope: Scope) -> Optional[str]:
+    """
+    The template of the route that will serve an HTTP request, or None
+    when no route matches its path and method.
+    """
+    app = scope.get("app")
+    if app is None or not hasattr(app, "router"):
+        return None
+
+    path = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    for regex, methods, template in _route_table(app):
+        if regex.match(path) and (methods is None or scope["method"] in methods):
+            return template
+    return None
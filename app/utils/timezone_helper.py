@@ -5,3 +5,8 @@ def make_aware(dt):
     if dt.tzinfo is None:
         return dt.replace(tzinfo=timezone.utc)
     return dt
+
+
+def to_utc(dt):
+    """Convert to UTC, treating naive datetimes as UTC already."""
+    return make_aware(dt).astimezone(timezone.utc)
@@ -0,0 +1,127 @@
+"""
+Before/after benchmark for the success_response pipeline on GET /todos.
+
+"before" swaps in the previous implementation (validate SuccessResponse,
+model_dump(mode="json"), re-encode with stdlib json in JSONResponse);
+"after" is the current EnvelopeResponse path.
+
+    python benchmarks/bench_list_response.py [--rows 100] [--repeat 300]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="flow-bench-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.v1.endpoints import todos_endpoint  # noqa: E402
+from app.core.security import create_access_token, hash_password  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.todo_model import TodoModel  # noqa: E402
+from app.models.user_model import UserModel  # noqa: E402
+from app.schemas.todo_schema import TodoResponse  # noqa: E402
+from app.utils import response as response_utils  # noqa: E402
+
+
+def legacy_success_response(data=None, message=None, meta=None, status_code=200):
+    response = response_utils.SuccessResponse(success=True, message=message, data=data, meta=meta)
+    return JSONResponse(
+        status_code=status_code,
+        content=response.model_dump(mode="json", exclude_none=True),
+    )
+
+
+def seed(rows: int) -> str:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = UserModel(id=str(uuid.uuid4()), email="bench@example.com", hashed_password=hash_password("x"))
+        db.add(user)
+        now = datetime.now(timezone.utc)
+        db.add_all([
+            TodoModel(
+                id=str(uuid.uuid4()),
+                title=f"Todo {i}",
+                description="Benchmark row with a short description",
+                priority=i % 4,
+                created_at=now,
+                updated_at=now - timedelta(seconds=i),
+                reminder_at=now + timedelta(days=1),
+                is_completed=False,
+                is_deleted=False,
+                is_synced=True,
+                user_id=user.id,
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def timed(fn, repeat: int) -> float:
+    """Median seconds per call over `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    user_id = seed(args.rows)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+    client = TestClient(app)
+    url = f"/api/v1/todos?limit={min(args.rows, 100)}"
+
+    db = SessionLocal()
+    todos = [TodoResponse.model_validate(todo) for todo in db.query(TodoModel).limit(args.rows)]
+    db.close()
+
+    results = {}
+    for label, builder in (("before", legacy_success_response), ("after", response_utils.success_response)):
+        todos_endpoint.success_response = builder
+        assert client.get(url, headers=headers).status_code == 200  # warm up
+        results[label] = {
+            "envelope_us": timed(lambda: builder(data=todos, meta={"pagination": None}), args.repeat) * 1e6,
+            "endpoint_us": timed(lambda: client.get(url, headers=headers), args.repeat) * 1e6,
+        }
+    todos_endpoint.success_response = response_utils.success_response
+
+    print(f"{args.rows} todos, median of {args.repeat} runs")
+    print(f"{'':10}{'envelope (us)':>16}{'GET /todos (us)':>18}")
+    for label, row in results.items():
+        print(f"{label:10}{row['envelope_us']:>16.1f}{row['endpoint_us']:>18.1f}")
+    print(
+        f"{'speedup':10}{results['before']['envelope_us'] / results['after']['envelope_us']:>15.2f}x"
+        f"{results['before']['endpoint_us'] / results['after']['endpoint_us']:>17.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        engine.dispose()
+        shutil.rmtree(_db_dir, ignore_errors=True)
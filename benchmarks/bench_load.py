@@ -0,0 +1,241 @@
+"""
+HTTP load test of app.main:app with a seeded SQLite dataset.
+
+Seeds N users x M todos into a temporary database, then drives the real
+application in-process (httpx ASGITransport) with concurrent virtual users
+running a weighted mix of list, get, patch, bulk create, login and refresh.
+Prints throughput and latency percentiles per route as JSON, so runs can be
+diffed between commits.
+
+    python benchmarks/bench_load.py [--users 50] [--todos 200] [--concurrency 20]
+                                    [--requests 2000] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="flow-load-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{_db_dir}/load.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Every virtual user shares one client address
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.security import create_access_token, create_refresh_token, hash_password  # noqa: E402
+from app.database.base import Base, RefreshTokenModel, TodoModel, UserModel  # noqa: E402
+from app.database.session import SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.logger import logger  # noqa: E402
+
+# The app logs to stdout, where the JSON report goes
+logger.setLevel(logging.ERROR)
+
+PASSWORD = "load-test-password"
+
+# Scenario -> (weight, route template reported)
+SCENARIOS = {
+    "list": (40, "GET /api/v1/todos"),
+    "get": (25, "GET /api/v1/todos/{todo_id}"),
+    "patch": (15, "PATCH /api/v1/todos/{todo_id}"),
+    "bulk_create": (5, "POST /api/v1/todos/bulk/create"),
+    "login": (5, "POST /api/v1/auth/login"),
+    "refresh": (10, "POST /api/v1/auth/refresh"),
+}
+
+
+class VirtualUser:
+    """One seeded account with its credentials and known todo ids."""
+
+    def __init__(self, user_id: str, email: str, todo_ids: list, refresh_token: str):
+        self.user_id = user_id
+        self.email = email
+        self.todo_ids = todo_ids
+        self.refresh_token = refresh_token
+        self.headers = {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+        self.lock = asyncio.Lock()  # refresh tokens rotate, so one rotation at a time
+
+
+def seed(users: int, todos_per_user: int) -> list:
+    """Insert the dataset with multi-row INSERTs; hashes the password once."""
+    Base.metadata.create_all(bind=engine)
+    hashed = hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+    virtual_users = []
+
+    db = SessionLocal()
+    try:
+        for u in range(users):
+            user_id = str(uuid.uuid4())
+            email = f"load{u}@example.com"
+            db.execute(insert(UserModel), [{"id": user_id, "email": email, "hashed_password": hashed}])
+
+            todo_ids = [str(uuid.uuid4()) for _ in range(todos_per_user)]
+            if todo_ids:
+                db.execute(insert(TodoModel), [
+                    {
+                        "id": todo_id,
+                        "title": f"Todo {i}",
+                        "description": "Seeded for the load test",
+                        "priority": i % 4,
+                        "created_at": now,
+                        "updated_at": now - timedelta(seconds=i),
+                        "is_completed": i % 3 == 0,
+                        "is_deleted": False,
+                        "is_synced": True,
+                        "user_id": user_id,
+                    }
+                    for i, todo_id in enumerate(todo_ids)
+                ])
+
+            refresh_token = create_refresh_token()
+            db.add(RefreshTokenModel(user_id=user_id, token=refresh_token))
+            virtual_users.append(VirtualUser(user_id, email, todo_ids, refresh_token))
+        db.commit()
+    finally:
+        db.close()
+
+    return virtual_users
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, user: VirtualUser, rng: random.Random):
+    if name == "list":
+        return await client.get("/api/v1/todos", params={"limit": 20}, headers=user.headers)
+
+    if name == "get":
+        todo_id = rng.choice(user.todo_ids) if user.todo_ids else str(uuid.uuid4())
+        return await client.get(f"/api/v1/todos/{todo_id}", headers=user.headers)
+
+    if name == "patch":
+        todo_id = rng.choice(user.todo_ids) if user.todo_ids else str(uuid.uuid4())
+        return await client.patch(
+            f"/api/v1/todos/{todo_id}", json={"isCompleted": rng.random() < 0.5}, headers=user.headers
+        )
+
+    if name == "bulk_create":
+        todos = [{"title": f"Bulk {rng.randrange(1_000_000)}", "priority": rng.randrange(4)} for _ in range(10)]
+        return await client.post("/api/v1/todos/bulk/create", json={"todos": todos}, headers=user.headers)
+
+    if name == "login":
+        return await client.post("/api/v1/auth/login", json={"email": user.email, "password": PASSWORD})
+
+    async with user.lock:
+        response = await client.post("/api/v1/auth/refresh", json=user.refresh_token)
+        if response.status_code == 200:
+            user.refresh_token = response.json()["data"]["refresh_token"]
+        return response
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def drive(virtual_users: list, concurrency: int, total_requests: int, seed_value: int) -> dict:
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[name][0] for name in names]
+    samples = {SCENARIOS[name][1]: [] for name in names}
+    errors = {route: 0 for route in samples}
+    remaining = [total_requests]
+
+    async def worker(index: int, client: httpx.AsyncClient):
+        rng = random.Random(seed_value + index)
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            name = rng.choices(names, weights)[0]
+            route = SCENARIOS[name][1]
+            user = virtual_users[rng.randrange(len(virtual_users))]
+            start = time.perf_counter()
+            response = await run_scenario(client, name, user, rng)
+            samples[route].append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors[route] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i, client) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    routes = {}
+    for route, latencies in samples.items():
+        latencies.sort()
+        routes[route] = {
+            "requests": len(latencies),
+            "errors": errors[route],
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        }
+
+    completed = sum(route["requests"] for route in routes.values())
+    return {
+        "duration_s": round(elapsed, 3),
+        "requests": completed,
+        "errors": sum(errors.values()),
+        "throughput_rps": round(completed / elapsed, 2),
+        "routes": routes,
+    }
+
+
+async def main_async(args) -> dict:
+    virtual_users = seed(args.users, args.todos)
+    try:
+        results = await drive(virtual_users, args.concurrency, args.requests, args.seed)
+    finally:
+        if async_engine is not None:
+            await async_engine.dispose()
+    return {
+        "config": {
+            "users": args.users,
+            "todos_per_user": args.todos,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+            "database_async": async_engine is not None,
+        },
+        **results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--todos", type=int, default=200, help="Todos seeded per user")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(main_async(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        engine.dispose()
+        shutil.rmtree(_db_dir, ignore_errors=True)
@@ -0,0 +1,156 @@
+"""
+Latency benchmark for todo search against the 10 ms budget.
+
+Seeds --users users with --rows todos each, titles and descriptions drawn
+from a Zipf-distributed vocabulary, then times todo_crud.search_todos for
+a set of queries: single words, the first letters of a word being typed,
+multi-word queries, a word nobody uses, and the second page of a common
+word. Exits non-zero when any query's median is over --budget-ms.
+
+    python benchmarks/bench_search.py [--rows 100000] [--users 2] [--repeat 50]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="flow-bench-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import todo_crud  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.models.todo_model import TodoModel  # noqa: E402
+from app.models.user_model import UserModel  # noqa: E402
+
+COMMON_WORDS = (
+    "buy call email pay book send fix clean plan review prepare schedule pick write check order "
+    "milk bread eggs groceries mom dad dentist doctor report meeting invoice rent flight hotel "
+    "slides budget project draft notes car bike gym laundry kitchen plants birthday gift team "
+    "weekly monthly quarterly tomorrow today morning evening the for and to with from up"
+).split()
+
+QUERIES = (
+    "milk",
+    "report",
+    "m",
+    "gr",
+    "groc",
+    "buy milk",
+    "dentist appointment",
+    "weekly report draft",
+    "call mom tomorrow",
+    "zzz",
+)
+
+
+def vocabulary(size: int):
+    """Common words followed by rare ones, with Zipf weights by rank"""
+    words = COMMON_WORDS + [f"word{i}" for i in range(size - len(COMMON_WORDS))]
+    return words, [1 / rank for rank in range(1, len(words) + 1)]
+
+
+def seed(users: int, rows: int) -> str:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    words, weights = vocabulary(5000)
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        user_ids = [str(uuid.uuid4()) for _ in range(users)]
+        db.execute(insert(UserModel), [
+            {"id": user_id, "email": f"bench{i}@example.com", "hashed_password": "x"}
+            for i, user_id in enumerate(user_ids)
+        ])
+        # Interleave the users' todos, as concurrent clients would
+        for start in range(0, rows, 10_000):
+            for user_id in user_ids:
+                db.execute(insert(TodoModel), [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": " ".join(rng.choices(words, weights, k=rng.randint(2, 6))).capitalize(),
+                        "description": " ".join(rng.choices(words, weights, k=rng.randint(0, 20))) or None,
+                        "priority": i % 4,
+                        "is_completed": False,
+                        "is_deleted": False,
+                        "is_synced": True,
+                        "created_at": now - timedelta(seconds=rows - i),
+                        "updated_at": now - timedelta(seconds=rows - i),
+                        "user_id": user_id,
+                    }
+                    for i in range(start, min(start + 10_000, rows))
+                ])
+        db.commit()
+        return user_ids[0]
+    finally:
+        db.close()
+
+
+def timed(fn, repeat: int):
+    """Median and p95 milliseconds per call over `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Todos per user")
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    user_id = seed(args.users, args.rows)
+    print(f"seeded {args.users} x {args.rows} todos in {time.perf_counter() - start:.1f}s")
+
+    db = SessionLocal()
+    cases = []
+    for query in QUERIES:
+        terms = todo_crud.parse_search_terms(query)
+        cases.append((query, lambda terms=terms: todo_crud.search_todos(db, user_id, terms, limit=args.limit)))
+    first_page, _ = todo_crud.search_todos(db, user_id, ["report"], limit=args.limit)
+    todo, tier = first_page[-1]
+    cases.append(("report, page 2", lambda: todo_crud.search_todos(
+        db, user_id, ["report"], after=(tier, todo.id), limit=args.limit
+    )))
+
+    over_budget = []
+    print(f"{'query':24}{'results':>9}{'median (ms)':>14}{'p95 (ms)':>11}")
+    for label, search in cases:
+        results, has_more = search()  # warm up
+        median, p95 = timed(search, args.repeat)
+        count = f"{len(results)}{'+' if has_more else ''}"
+        print(f"{label:24}{count:>9}{median:>14.2f}{p95:>11.2f}")
+        if median > args.budget_ms:
+            over_budget.append(label)
+    db.close()
+
+    if over_budget:
+        print(f"over the {args.budget_ms:g} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print(f"every query within the {args.budget_ms:g} ms budget")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        engine.dispose()
+        shutil.rmtree(_db_dir, ignore_errors=True)
@@ -0,0 +1,90 @@
+"""
+JSON vs MessagePack encoding of the GET /todos response envelope.
+
+Measures the time to build and render the envelope with success_response
+in each negotiated format, and the resulting body size.
+
+    python benchmarks/bench_wire_format.py [--rows 100] [--repeat 1000]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from app.schemas.todo_schema import TodoResponse  # noqa: E402
+from app.utils.content_negotiation import JSON, MSGPACK, msgpack_available, response_format  # noqa: E402
+from app.utils.response import success_response  # noqa: E402
+
+
+def make_todos(rows: int):
+    now = datetime.now(timezone.utc)
+    return [
+        TodoResponse.model_validate({
+            "id": str(uuid.uuid4()),
+            "title": f"Todo {i}",
+            "description": "Benchmark row with a short description",
+            "priority": i % 4,
+            "created_at": now,
+            "updated_at": now - timedelta(seconds=i),
+            "reminder_at": now + timedelta(days=1),
+            "completed_at": None,
+            "is_completed": False,
+            "is_deleted": False,
+            "is_synced": True,
+            "user_id": str(uuid.uuid4()),
+        })
+        for i in range(rows)
+    ]
+
+
+def timed(fn, repeat: int) -> float:
+    """Median seconds per call over `repeat` calls"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not msgpack_available():
+        sys.exit("msgpack is not installed")
+
+    todos = make_todos(args.rows)
+    meta = {"pagination": {"next_cursor": "MTcwMDAwMDAwMDAwMDAwMDp4", "has_more": True}}
+
+    results = {}
+    for label in (JSON, MSGPACK):
+        token = response_format.set(label)
+        try:
+            body = success_response(data=todos, meta=meta).body
+            encode = timed(lambda: success_response(data=todos, meta=meta), args.repeat)
+        finally:
+            response_format.reset(token)
+        results[label] = {"encode_us": encode * 1e6, "bytes": len(body)}
+
+    print(f"{args.rows} todos, median of {args.repeat} runs")
+    print(f"{'':10}{'encode (us)':>14}{'bytes':>10}")
+    for label, row in results.items():
+        print(f"{label:10}{row['encode_us']:>14.1f}{row['bytes']:>10}")
+    print(
+        f"{'msgpack/json':10}{results[MSGPACK]['encode_us'] / results[JSON]['encode_us']:>12.2f}x"
+        f"{results[MSGPACK]['bytes'] / results[JSON]['bytes']:>9.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Micro-benchmarks for the auth and serialization hot paths.
+
+Times JWT creation and decoding, get_current_user against a warm SQLite
+database, TodoResponse validation of ORM rows, success_response envelopes
+and the request validation error handler. Results can be saved as a
+baseline; later runs are compared against it and exit non-zero when any
+benchmark is slower than the baseline by more than the threshold.
+
+    python benchmarks/micro.py                  # run, compare if a baseline exists
+    python benchmarks/micro.py --save           # run and save as the baseline
+    python benchmarks/micro.py --filter jwt --threshold 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="flow-micro-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{_db_dir}/micro.db"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from fastapi.exceptions import RequestValidationError  # noqa: E402
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from jose import jwt  # noqa: E402
+from pydantic import ValidationError  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+
+from app.core.security import (  # noqa: E402
+    ALGORITHM,
+    SECRET_KEY,
+    create_access_token,
+    decode_access_token,
+    get_current_user,
+    hash_password,
+    token_cache,
+    user_cache,
+)
+from app.database.base import Base, TodoModel, UserModel  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.main import validation_exception_handler  # noqa: E402
+from app.schemas.todo_schema import TodoCreate, TodoResponse  # noqa: E402
+from app.utils.response import success_response  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "micro.json")
+ROWS = 100
+
+
+def seed():
+    """One user with ROWS todos; returns (user_id, ORM rows, open session)."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = UserModel(id=str(uuid.uuid4()), email="micro@example.com", hashed_password=hash_password("x"))
+    db.add(user)
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        TodoModel(
+            id=str(uuid.uuid4()),
+            title=f"Todo {i}",
+            description="Benchmark row with a short description",
+            priority=i % 4,
+            created_at=now,
+            updated_at=now - timedelta(seconds=i),
+            reminder_at=now + timedelta(days=1),
+            is_completed=False,
+            is_deleted=False,
+            is_synced=True,
+            user_id=user.id,
+        )
+        for i in range(ROWS)
+    ])
+    db.commit()
+    rows = db.query(TodoModel).all()
+    return user.id, rows, db
+
+
+def build_benchmarks(user_id, rows, db, loop):
+    """name -> zero-argument callable running one operation"""
+    token = create_access_token({"sub": user_id})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    todos = [TodoResponse.model_validate(row) for row in rows]
+    request = Request({"type": "http", "method": "POST", "path": "/api/v1/todos", "headers": []})
+    try:
+        TodoCreate.model_validate({"title": "", "priority": 9})
+    except ValidationError as e:
+        validation_error = RequestValidationError(e.errors())
+
+    def run(coro_fn):
+        return lambda: loop.run_until_complete(coro_fn())
+
+    def current_user_uncached():
+        user_cache.clear()
+        return get_current_user(credentials, db)
+
+    def decode_uncached():
+        token_cache.clear()
+        return decode_access_token(token)
+
+    return {
+        "jwt.create_access_token": lambda: create_access_token({"sub": user_id}),
+        "jwt.decode": lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]),
+        "jwt.decode_access_token_cached": lambda: decode_access_token(token),
+        "jwt.decode_access_token_uncached": decode_uncached,
+        "auth.get_current_user_cached": run(lambda: get_current_user(credentials, db)),
+        "auth.get_current_user_uncached": run(current_user_uncached),
+        f"todo.model_validate_{ROWS}_rows": lambda: [TodoResponse.model_validate(row) for row in rows],
+        f"response.success_envelope_{ROWS}_todos": lambda: success_response(data=todos, meta={"pagination": None}),
+        "response.validation_error_handler": run(lambda: validation_exception_handler(request, validation_error)),
+    }
+
+
+def measure(fn, repeat: int, min_time: float) -> dict:
+    """Calibrate a loop count taking ~min_time, then time `repeat` loops"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+
+    per_op = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_op.append((time.perf_counter() - start) / number)
+    per_op.sort()
+    return {
+        "min_us": round(per_op[0] * 1e6, 3),
+        "median_us": round(per_op[len(per_op) // 2] * 1e6, 3),
+        "loops": number,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print a comparison table; returns the names of regressed benchmarks"""
+    regressions = []
+    print(f"{'benchmark':45}{'baseline (us)':>15}{'now (us)':>12}{'change':>10}")
+    for name, result in results.items():
+        before = baseline.get(name, {}).get("min_us")
+        if not before:
+            print(f"{name:45}{'-':>15}{result['min_us']:>12.2f}{'new':>10}")
+            continue
+        change = result["min_us"] / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:45}{before:>15.2f}{result['min_us']:>12.2f}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Save the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown, e.g. 0.2 = 20%%")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed loop")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    user_id, rows, db = seed()
+    try:
+        benchmarks = build_benchmarks(user_id, rows, db, loop)
+        results = {}
+        for name, fn in benchmarks.items():
+            if args.filter in name:
+                results[name] = measure(fn, args.repeat, args.min_time)
+    finally:
+        db.close()
+        loop.close()
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(json.dumps(results, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(json.dumps(results, indent=2))
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+    finally:
+        engine.dispose()
+        shutil.rmtree(_db_dir, ignore_errors=True)
+    sys.exit(exit_code)
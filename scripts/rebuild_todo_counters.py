@@ -0,0 +1,69 @@
+"""
+Rebuild the todo_counters table from the todos themselves.
+
+Counters are maintained incrementally by every write path; this recounts
+live todos from scratch, for one user or everyone, in one transaction,
+and prints the buckets that changed. With --check nothing is written and
+the exit status is 1 when any counter had drifted.
+
+    python scripts/rebuild_todo_counters.py [--user-id <id>] [--check]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.database.base import TodoCounterModel  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.database.todo_counter_crud import rebuild_todo_counts  # noqa: E402
+
+
+def snapshot(db, user_id=None) -> dict:
+    """(user_id, is_completed, priority) -> count, without empty buckets"""
+    stmt = select(
+        TodoCounterModel.user_id, TodoCounterModel.is_completed, TodoCounterModel.priority, TodoCounterModel.count
+    ).where(TodoCounterModel.count != 0)
+    if user_id is not None:
+        stmt = stmt.where(TodoCounterModel.user_id == user_id)
+    return {(row[0], row[1], row[2]): row[3] for row in db.execute(stmt)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user-id", help="Only rebuild this user's counters")
+    parser.add_argument("--check", action="store_true", help="Report drift without writing")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        before = snapshot(db, args.user_id)
+        rows = rebuild_todo_counts(db, args.user_id)
+        after = snapshot(db, args.user_id)
+
+        drifted = sorted(key for key in before.keys() | after.keys() if before.get(key, 0) != after.get(key, 0))
+        for user_id, is_completed, priority in drifted:
+            key = (user_id, is_completed, priority)
+            state = "completed" if is_completed else "open"
+            print(f"{user_id} {state} priority={priority}: {before.get(key, 0)} -> {after.get(key, 0)}")
+
+        if args.check:
+            db.rollback()
+            print(f"{len(drifted)} counter(s) drifted")
+            return 1 if drifted else 0
+
+        db.commit()
+        print(f"Rebuilt {rows} counter row(s); {len(drifted)} corrected")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = main()
+    finally:
+        engine.dispose()
+    sys.exit(exit_code)
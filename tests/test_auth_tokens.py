@@ -0,0 +1,165 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.rate_limit import rate_limiter
+from app.database.session import get_db, Base
+from app.models.refresh_token_model import RefreshTokenModel
+from app.services.token_sweeper import RefreshTokenSweeper
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import pytest
+
+# Setup test DB
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@pytest.fixture(scope="module")
+def engine_test(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test_auth.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    TestingSessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def test_db(engine_test):
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.drop_all(bind=engine_test)
+    Base.metadata.create_all(bind=engine_test)
+    rate_limiter.clear()
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def login(email="tokens@example.com"):
+    client.post("/api/v1/auth/register", json={"email": email, "password": "password123"})
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    return response.json()["data"]
+
+
+def test_refresh_rotates_token_once(caplog):
+    old_token = login()["refresh_token"]
+
+    with caplog.at_level("DEBUG", logger="flow_backend"):
+        rotated = client.post("/api/v1/auth/refresh", json=old_token)
+    assert rotated.status_code == 200
+    new_token = rotated.json()["data"]["refresh_token"]
+    # Refresh tokens are bearer credentials and never logged
+    assert not any(old_token in record.getMessage() for record in caplog.records)
+
+    reused = client.post("/api/v1/auth/refresh", json=old_token)
+    assert reused.status_code == 401
+    assert reused.json()["error_code"] == "INVALID_TOKEN"
+    assert client.post("/api/v1/auth/refresh", json=new_token).status_code == 200
+
+
+def test_refresh_rejects_and_deletes_expired_token():
+    token = login()["refresh_token"]
+    db = TestingSessionLocal()
+    db.query(RefreshTokenModel).update({"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+    db.commit()
+
+    expired = client.post("/api/v1/auth/refresh", json=token)
+    assert expired.json()["error_code"] == "TOKEN_EXPIRED"
+    assert db.query(RefreshTokenModel).count() == 0
+    db.close()
+
+
+def test_sweeper_purges_expired_tokens_in_batches():
+    user_id = login()["user"]["id"]
+    now = datetime.now(timezone.utc)
+    db = TestingSessionLocal()
+    db.add_all([
+        RefreshTokenModel(user_id=user_id, token=f"expired-{i}", expires_at=now - timedelta(days=1))
+        for i in range(5)
+    ])
+    db.commit()
+
+    @asynccontextmanager
+    async def session_factory():
+        session = TestingSessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    sweeper = RefreshTokenSweeper(interval=0, batch_size=2, max_batches=2, session_factory=session_factory)
+    assert asyncio.run(sweeper.sweep()) == 4
+    assert asyncio.run(sweeper.sweep()) == 1
+
+    # Only the unexpired login token is left
+    assert [token.user_id for token in db.query(RefreshTokenModel)] == [user_id]
+    db.close()
+
+
+def test_anonymous_requests_are_throttled_per_route():
+    for _ in range(20):
+        assert client.post("/api/v1/auth/check-email", json={"email": "a@example.com"}).status_code == 200
+
+    throttled = client.post("/api/v1/auth/check-email", json={"email": "a@example.com"})
+    assert throttled.status_code == 429
+    assert throttled.json()["error_code"] == "RATE_LIMITED"
+    assert int(throttled.headers["retry-after"]) >= 1
+
+    # Other routes draw from a separate budget
+    assert client.get("/api/v1/health").status_code == 200
+
+    # Throttled requests are counted under the route they were aimed at
+    metrics = client.get("/metrics").text.splitlines()
+    assert any(
+        line.startswith('flow_http_requests_total{method="POST",route="/api/v1/auth/check-email",status="429"}')
+        for line in metrics
+    )
+
+
+def test_route_budgets_are_keyed_by_route_template():
+    from fastapi import APIRouter, FastAPI
+    from app.core.rate_limit import TokenBucketLimiter
+    from app.middleware.rate_limit import RateLimitMiddleware
+
+    router = APIRouter()
+
+    @router.put("/items/{item_id}")
+    def put_item(item_id: str):
+        return {"id": item_id}
+
+    @router.get("/items/{item_id}")
+    def get_item(item_id: str):
+        return {"id": item_id}
+
+    limited = FastAPI()
+    limited.include_router(router, prefix="/api")
+    limited.add_middleware(
+        RateLimitMiddleware, limiter=TokenBucketLimiter(max_keys=10, idle_seconds=60),
+        routes={"PUT /api/items/{item_id}": "2/60"}, default="",
+    )
+    limited_client = TestClient(limited)
+
+    # Every id draws from the one budget of the route
+    assert limited_client.put("/api/items/a").status_code == 200
+    assert limited_client.put("/api/items/b").status_code == 200
+    assert limited_client.put("/api/items/c").status_code == 429
+    assert limited_client.get("/api/items/c").status_code == 200
@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+from app.core.config import settings
+from app.database.session import get_engine_options, get_pool_stats, install_pool_counters, install_sqlite_pragmas
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+
+def test_engine_options_and_sqlite_pragmas_follow_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 2)
+    monkeypatch.setattr(settings, "SQLITE_JOURNAL_MODE", "WAL")
+    monkeypatch.setattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 1234)
+    monkeypatch.setattr(settings, "SQLITE_SYNCHRONOUS", "")
+
+    # In-memory SQLite keeps its single-connection pool unsized
+    memory = get_engine_options(make_url("sqlite://"))
+    assert "pool_size" not in memory and memory["connect_args"] == {"check_same_thread": False}
+    server = get_engine_options(make_url("postgresql+asyncpg://user@localhost/flow"))
+    assert "connect_args" not in server
+    # Pre-ping is on by default only where connections can go stale
+    assert (memory["pool_pre_ping"], server["pool_pre_ping"]) == (False, True)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", True)
+    assert get_engine_options(make_url("sqlite://"))["pool_pre_ping"] is True
+    assert (server["pool_size"], server["max_overflow"]) == (3, 2)
+
+    url = make_url(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    options = get_engine_options(url)
+    assert (options["pool_size"], options["max_overflow"]) == (3, 2)
+    engine = create_engine(url, **options)
+    install_sqlite_pragmas(engine)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            # An empty setting leaves SQLite's default (FULL)
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 2
+    finally:
+        engine.dispose()
+
+
+def test_pool_counters_time_checkout_waits(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    url = make_url(f"sqlite:///{tmp_path / 'pool.db'}")
+    engine = create_engine(url, **get_engine_options(url))
+    install_pool_counters(engine)
+    try:
+        held = engine.connect()
+        waiter = threading.Thread(target=lambda: engine.connect().close())
+        waiter.start()
+        time.sleep(0.2)
+        held.close()
+        waiter.join()
+
+        stats = get_pool_stats(engine)
+        assert stats["pool"] == "TimedQueuePool"
+        assert stats["checkouts"] == 2
+        assert stats["checkout_wait_seconds"] >= 0.15
+
+        # Kept across dispose(), which replaces the pool
+        engine.dispose()
+        with engine.connect():
+            pass
+        assert get_pool_stats(engine)["checkouts"] == 3
+        assert get_pool_stats(engine)["checkout_wait_seconds"] >= 0.15
+    finally:
+        engine.dispose()
@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timezone
+import uuid
+
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.core.rate_limit import rate_limiter
+from app.database.session import get_db, Base
+from app.models.todo_model import TodoModel
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import pytest
+
+# Setup test DB
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@pytest.fixture(scope="module")
+def engine_test(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test_middleware.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    TestingSessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def test_db(engine_test):
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.drop_all(bind=engine_test)
+    Base.metadata.create_all(bind=engine_test)
+    rate_limiter.clear()
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def auth_headers(email="middleware@example.com"):
+    client.post("/api/v1/auth/register", json={"email": email, "password": "password123"})
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def seed_todos(user_id, count, updated_at):
+    db = TestingSessionLocal()
+    try:
+        db.add_all([
+            TodoModel(
+                id=str(uuid.uuid4()),
+                title=f"Todo {i}",
+                created_at=updated_at,
+                updated_at=updated_at,
+                is_completed=False,
+                is_deleted=False,
+                user_id=user_id,
+            )
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_server_timing_reports_queries_and_warns_over_limit(monkeypatch, caplog):
+    headers, user_id = auth_headers()
+    seed_todos(user_id, 3, datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    response = client.get("/api/v1/todos", headers=headers)
+    db_timing = response.headers["server-timing"].split(",")[0]
+    assert db_timing.startswith("db;dur=")
+    assert int(db_timing.split('desc="')[1].split()[0]) >= 2  # version + page
+
+    monkeypatch.setattr(settings, "QUERY_COUNT_WARN_THRESHOLD", 1)
+    with caplog.at_level("WARNING", logger="flow_backend"):
+        client.get("/api/v1/todos", headers=headers)
+    assert any("GET /api/v1/todos ran" in record.getMessage() for record in caplog.records)
+
+
+def test_profiling_middleware_writes_pstats(tmp_path):
+    import pstats
+    from app.middleware.profiling import ProfilingMiddleware
+
+    headers, _ = auth_headers()
+    profiled_client = TestClient(ProfilingMiddleware(app, secret="s3cret", sample_rate=0, output_dir=str(tmp_path)))
+
+    assert "x-profile" not in profiled_client.get("/api/v1/todos", headers=headers).headers
+    assert "x-profile" not in profiled_client.get(
+        "/api/v1/todos", headers={**headers, "X-Profile": "wrong"}
+    ).headers
+
+    response = profiled_client.get("/api/v1/todos", headers={**headers, "X-Profile": "s3cret"})
+    assert response.status_code == 200
+    profile = tmp_path / response.headers["x-profile"]
+    assert pstats.Stats(str(profile)).total_calls > 0
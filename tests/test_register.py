@@ -10,11 +10,17 @@ from sqlalchemy.orm import sessionmaker
 import pytest
 
 # Setup test DB
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine_test = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine_test)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def engine_test(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    TestingSessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
 
-Base.metadata.create_all(bind=engine_test)
 
 def override_get_db():
     try:
@@ -27,7 +33,7 @@ app.dependency_overrides[get_db] = override_get_db
 
 client = TestClient(app)
 
-def test_register_with_name():
+def test_register_with_name(engine_test):
     # Cleanup
     Base.metadata.drop_all(bind=engine_test)
     Base.metadata.create_all(bind=engine_test)
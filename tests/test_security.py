@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import JWTError
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1, ttl=-1)
+    assert cache.get("a") is None
+
+
+def test_decode_access_token_is_cached_until_expiry():
+    token = create_access_token({"sub": "user-1"})
+    hits = token_cache.hits
+
+    assert decode_access_token(token)["sub"] == "user-1"
+    assert decode_access_token(token)["sub"] == "user-1"
+    assert token_cache.hits == hits + 1
+
+
+def test_decode_access_token_rejects_tampered_token():
+    token = create_access_token({"sub": "user-1"})
+    with pytest.raises(JWTError):
+        decode_access_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+def test_worker_pool_rejects_work_beyond_queue_limit():
+    import asyncio
+    import threading
+    from app.core.worker_pool import BoundedWorkerPool, WorkerPoolFull
+
+    pool = BoundedWorkerPool(name="test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["queue_depth"] == 1
+        with pytest.raises(WorkerPoolFull):
+            await pool.run(lambda: "rejected")
+        release.set()
+        return await running, await queued
+
+    assert asyncio.run(scenario()) == (True, "queued")
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    pool.shutdown()
+
+
+def test_token_bucket_limits_and_evicts_idle_keys(monkeypatch):
+    from app.core import rate_limit
+    from app.core.rate_limit import RateLimit, TokenBucketLimiter, parse_rate_limit
+
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    limiter = TokenBucketLimiter(max_keys=10, idle_seconds=60)
+    limit = parse_rate_limit("2/10")
+    assert limit == RateLimit(2, 10.0)
+
+    assert limiter.acquire("a", limit) == 0
+    assert limiter.acquire("a", limit) == 0
+    assert limiter.acquire("a", limit) == pytest.approx(5.0)
+    assert limiter.acquire("b", limit) == 0
+
+    clock[0] += 5
+    assert limiter.acquire("a", limit) == 0
+
+    clock[0] += 60
+    limiter.acquire("c", limit)
+    assert limiter.stats()["keys"] == 1
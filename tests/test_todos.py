@@ -0,0 +1,794 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+import json
+import threading
+import time
+import uuid
+
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+from app.core.metrics import request_metrics
+from app.core.rate_limit import rate_limiter
+from app.database.session import get_db, Base
+from app.database.reminder_crud import claim_due_reminders
+from app.database.todo_counter_crud import get_todo_stats, rebuild_todo_counts
+from app.database import todo_crud
+from app.database.todo_crud import apply_sync_operations, bulk_update_todos, soft_delete_todo, update_todo
+from app.models.todo_model import TodoModel
+from app.schemas.todo_schema import TodoExport, TodoResponse, TodoSyncOperation
+from app.services.reminder_scheduler import QueueSink, ReminderScheduler
+from app.utils.ndjson import iter_ndjson_lines
+from app.utils.response import ErrorResponse, SuccessResponse, error_response, success_response
+from app.utils.timezone_helper import make_aware
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import pytest
+
+# Setup test DB
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@pytest.fixture(scope="module")
+def engine_test(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test_todos.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    TestingSessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def test_db(engine_test):
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    Base.metadata.drop_all(bind=engine_test)
+    Base.metadata.create_all(bind=engine_test)
+    rate_limiter.clear()
+    request_metrics.clear()
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def auth_headers(email="todos@example.com"):
+    client.post("/api/v1/auth/register", json={"email": email, "password": "password123"})
+    response = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def seed_todos(user_id, count, updated_at):
+    db = TestingSessionLocal()
+    try:
+        db.add_all([
+            TodoModel(
+                id=str(uuid.uuid4()),
+                title=f"Todo {i}",
+                created_at=updated_at,
+                updated_at=updated_at,
+                is_completed=False,
+                is_deleted=False,
+                user_id=user_id,
+            )
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_list_pagination_with_shared_timestamps():
+    headers, user_id = auth_headers()
+    # All rows share one timestamp: whole-second cursors used to skip them
+    seed_todos(user_id, 25, datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc))
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/todos", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(todo["id"] for todo in body["data"])
+        pagination = body["meta"].get("pagination")
+        if not pagination:
+            break
+        cursor = pagination["next_cursor"]
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+
+
+def test_list_rejects_malformed_cursor():
+    headers, _ = auth_headers()
+    response = client.get("/api/v1/todos", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "VALIDATION_ERROR"
+
+
+def test_conditional_get_returns_304_until_todos_change():
+    headers, _ = auth_headers()
+    todo_id = client.post("/api/v1/todos", json={"title": "Cached"}, headers=headers).json()["data"]["id"]
+
+    listed = client.get("/api/v1/todos", headers=headers)
+    list_etag = listed.headers["etag"]
+    single = client.get(f"/api/v1/todos/{todo_id}", headers=headers)
+    todo_etag = single.headers["etag"]
+
+    not_modified = client.get("/api/v1/todos", headers={**headers, "If-None-Match": list_etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get(
+        f"/api/v1/todos/{todo_id}", headers={**headers, "If-None-Match": todo_etag}
+    ).status_code == 304
+
+    # Other query parameters are a different representation
+    filtered = client.get("/api/v1/todos?limit=5", headers={**headers, "If-None-Match": list_etag})
+    assert filtered.status_code == 200
+
+    client.patch(f"/api/v1/todos/{todo_id}", json={"isCompleted": True}, headers=headers)
+    relisted = client.get("/api/v1/todos", headers={**headers, "If-None-Match": list_etag})
+    assert relisted.status_code == 200
+    assert relisted.headers["etag"] != list_etag
+    refetched = client.get(f"/api/v1/todos/{todo_id}", headers={**headers, "If-None-Match": todo_etag})
+    assert refetched.status_code == 200
+    assert refetched.json()["data"]["is_completed"] is True
+
+
+def test_changes_feed_returns_updates_and_tombstones(monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_CHANGES_OVERLAP_SECONDS", 0)
+    headers, _ = auth_headers()
+    first = client.post("/api/v1/todos", json={"title": "Keep"}, headers=headers).json()["data"]
+    second = client.post("/api/v1/todos", json={"title": "Drop"}, headers=headers).json()["data"]
+
+    response = client.get("/api/v1/todos/changes", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert [todo["id"] for todo in body["data"]] == [first["id"], second["id"]]
+    token = body["meta"]["sync"]["next_token"]
+
+    # Nothing changed: same token comes back
+    body = client.get("/api/v1/todos/changes", params={"since": token}, headers=headers).json()
+    assert body["data"] == []
+    assert body["meta"]["sync"]["next_token"] == token
+
+    client.delete(f"/api/v1/todos/{second['id']}", headers=headers)
+    body = client.get("/api/v1/todos/changes", params={"since": token}, headers=headers).json()
+    assert [todo["id"] for todo in body["data"]] == [second["id"]]
+    assert body["data"][0]["is_deleted"] is True
+
+
+def test_changes_feed_rereads_overlap_for_late_commits():
+    headers, user_id = auth_headers()
+    seen = client.post("/api/v1/todos", json={"title": "Seen"}, headers=headers).json()["data"]
+    token = client.get("/api/v1/todos/changes", headers=headers).json()["meta"]["sync"]["next_token"]
+
+    # A write stamped before the read above, committed after it
+    late_id = str(uuid.uuid4())
+    stamped_at = datetime.fromisoformat(seen["updated_at"]) - timedelta(seconds=1)
+    db = TestingSessionLocal()
+    db.add(TodoModel(
+        id=late_id, title="Late", created_at=stamped_at, updated_at=stamped_at,
+        is_completed=False, is_deleted=False, user_id=user_id,
+    ))
+    db.commit()
+    db.close()
+
+    body = client.get("/api/v1/todos/changes", params={"since": token}, headers=headers).json()
+    assert [todo["id"] for todo in body["data"]] == [late_id, seen["id"]]
+
+
+def test_changes_feed_settles_once_past_the_overlap():
+    headers, user_id = auth_headers()
+    seed_todos(user_id, 3, datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    body = client.get("/api/v1/todos/changes", headers=headers).json()
+    assert len(body["data"]) == 3
+    token = body["meta"]["sync"]["next_token"]
+
+    # No writes: changes older than the overlap window aren't sent again
+    for _ in range(2):
+        body = client.get("/api/v1/todos/changes", params={"since": token}, headers=headers).json()
+        assert body["data"] == []
+        assert body["meta"]["sync"]["next_token"] == token
+
+
+def test_sync_applies_batch_with_last_write_wins():
+    headers, _ = auth_headers()
+    todo_id = str(uuid.uuid4())
+    missing_id = str(uuid.uuid4())
+
+    response = client.post("/api/v1/todos/sync", json={"operations": [
+        {"op": "create", "id": todo_id, "updatedAt": "2025-01-01T10:00:00Z", "data": {"title": "Offline"}},
+        {"op": "update", "id": todo_id, "updatedAt": "2025-01-01T10:05:00Z", "data": {"isCompleted": True}},
+        {"op": "update", "id": missing_id, "updatedAt": "2025-01-01T10:05:00Z", "data": {"title": "x"}},
+        {"op": "create", "id": str(uuid.uuid4()), "updatedAt": "2025-01-01T10:05:00Z", "data": {}},
+    ]}, headers=headers)
+    assert response.status_code == 200
+    results = response.json()["data"]["results"]
+    assert [result["status"] for result in results] == ["applied", "applied", "not_found", "invalid"]
+    assert results[1]["todo"]["is_completed"] is True
+
+    # The server copy is now newer than this stale offline edit
+    response = client.post("/api/v1/todos/sync", json={"operations": [
+        {"op": "delete", "id": todo_id, "updatedAt": "2025-01-01T09:00:00Z"},
+    ]}, headers=headers)
+    result = response.json()["data"]["results"][0]
+    assert result["status"] == "conflict"
+    assert result["todo"]["is_deleted"] is False
+
+
+def test_sync_compares_client_edit_times_within_the_users_todos():
+    headers, _ = auth_headers()
+    other_headers, _ = auth_headers("other@example.com")
+    todo_id = str(uuid.uuid4())
+
+    def sync(operations, headers=headers):
+        response = client.post("/api/v1/todos/sync", json={"operations": operations}, headers=headers)
+        return [result["status"] for result in response.json()["data"]["results"]]
+
+    assert sync([{"op": "create", "id": todo_id, "updatedAt": "2020-01-01T10:10:00Z", "data": {"title": "A"}}]) == ["applied"]
+
+    # Applied later on the server, but edited offline before the synced edit
+    assert sync([{"op": "update", "id": todo_id, "updatedAt": "2020-01-01T10:05:00Z", "data": {"title": "B"}}]) == ["conflict"]
+    # Edited offline after it, in another time zone
+    assert sync([{"op": "update", "id": todo_id, "updatedAt": "2020-01-01T12:20:00+02:00", "data": {"title": "C"}}]) == ["applied"]
+
+    # A server-side edit is compared by its own time
+    client.patch(f"/api/v1/todos/{todo_id}", json={"title": "D"}, headers=headers)
+    assert sync([{"op": "update", "id": todo_id, "updatedAt": "2020-01-01T11:00:00Z", "data": {"title": "E"}}]) == ["conflict"]
+
+    # Another user's id is neither found nor attributed to anyone
+    response = client.post("/api/v1/todos/sync", json={"operations": [
+        {"op": "update", "id": todo_id, "updatedAt": "2030-01-01T10:00:00Z", "data": {"title": "Mine"}},
+        {"op": "delete", "id": todo_id, "updatedAt": "2030-01-01T10:00:00Z"},
+        {"op": "create", "id": todo_id, "updatedAt": "2030-01-01T10:00:00Z", "data": {"title": "Mine"}},
+    ]}, headers=other_headers)
+    results = response.json()["data"]["results"]
+    assert [result["status"] for result in results] == ["not_found", "not_found", "invalid"]
+    assert results[2]["error"] == "Todo ID is not available"
+    assert client.get(f"/api/v1/todos/{todo_id}", headers=headers).json()["data"]["title"] == "D"
+
+
+def test_bulk_create_reports_invalid_items_by_index():
+    headers, _ = auth_headers()
+    response = client.post("/api/v1/todos/bulk/create", json={"todos": [
+        {"title": "One"},
+        {"title": "Two", "priority": 9},
+        {"title": "Three", "isCompleted": True},
+    ]}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["created_count"] == 2
+    assert [todo["title"] for todo in data["created"]] == ["One", "Three"]
+    assert data["created"][1]["is_completed"] is True
+    assert [failure["index"] for failure in data["failed"]] == [1]
+
+    listed = client.get("/api/v1/todos", headers=headers).json()["data"]
+    assert {todo["title"] for todo in listed} == {"One", "Three"}
+
+
+def test_msgpack_negotiation_and_request_bodies():
+    msgpack = pytest.importorskip("msgpack")
+    headers, _ = auth_headers()
+    msgpack_headers = {**headers, "Accept": "application/msgpack", "Content-Type": "application/msgpack"}
+
+    created = client.post(
+        "/api/v1/todos/bulk/create",
+        content=msgpack.packb({"todos": [{"title": "Packed"}, {"priority": 1}]}),
+        headers=msgpack_headers,
+    )
+    assert created.status_code == 200
+    assert created.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(created.content)["data"]
+    assert data["created_count"] == 1
+    assert data["failed"][0]["index"] == 1
+
+    listed = client.get("/api/v1/todos", headers=msgpack_headers)
+    as_json = client.get("/api/v1/todos", headers=headers)
+    assert msgpack.unpackb(listed.content) == as_json.json()
+    assert listed.headers["etag"] != as_json.headers["etag"]
+
+    invalid = client.post("/api/v1/todos/sync", content=b"\xc1", headers=msgpack_headers)
+    assert invalid.status_code == 400
+    assert msgpack.unpackb(invalid.content)["error_code"] == "VALIDATION_ERROR"
+
+
+def test_envelopes_render_like_a_dumped_model():
+    now = datetime(2030, 1, 1, 10, 0, 0, 123456, tzinfo=timezone.utc)
+    todo = TodoResponse.model_validate({
+        "id": str(uuid.uuid4()), "title": "Caf\u00e9 \u2615", "createdAt": now, "updatedAt": now, "completedAt": None,
+    })
+    envelopes = [
+        (
+            success_response(data=[todo], meta={"pagination": None, "at": now}),
+            SuccessResponse(data=[todo], meta={"pagination": None, "at": now}),
+        ),
+        (success_response(message="Done"), SuccessResponse(message="Done")),
+        (error_response("Nope", "NOT_FOUND", status_code=404), ErrorResponse(message="Nope", error_code="NOT_FOUND")),
+    ]
+    for response, model in envelopes:
+        # The previous path: model_dump(mode="json"), then the stdlib encoder
+        legacy = JSONResponse(content=model.model_dump(mode="json", exclude_none=True))
+        assert response.body == legacy.body
+        assert response.headers["content-type"] == "application/json"
+
+
+def test_bulk_patch_and_delete_by_ids():
+    headers, _ = auth_headers()
+    created = client.post("/api/v1/todos/bulk/create", json={"todos": [
+        {"title": "A"}, {"title": "B"}, {"title": "C"},
+    ]}, headers=headers).json()["data"]["created"]
+    ids = [todo["id"] for todo in created]
+    missing_id = str(uuid.uuid4())
+
+    response = client.patch("/api/v1/todos/bulk", json={
+        "ids": ids[:2] + [missing_id],
+        "changes": {"isCompleted": True, "priority": 3},
+    }, headers=headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert sorted(data["updated_ids"]) == sorted(ids[:2])
+    assert data["not_found_ids"] == [missing_id]
+
+    # Explicit nulls for required fields are rejected, not written
+    for changes in ({"priority": None}, {"isCompleted": None}, {"title": None}):
+        response = client.patch("/api/v1/todos/bulk", json={"ids": ids, "changes": changes}, headers=headers)
+        assert response.status_code == 400
+    assert client.patch(f"/api/v1/todos/{ids[0]}", json={"priority": None}, headers=headers).status_code == 400
+    # Nullable fields can still be cleared
+    response = client.patch("/api/v1/todos/bulk", json={"ids": ids, "changes": {"reminderAt": None}}, headers=headers)
+    assert response.status_code == 200
+    assert client.get("/api/v1/todos/search", params={"q": "A"}, headers=headers).status_code == 200
+
+    response = client.request("DELETE", "/api/v1/todos/bulk", json={"ids": ids[1:]}, headers=headers)
+    assert response.status_code == 200
+    assert sorted(response.json()["data"]["deleted_ids"]) == sorted(ids[1:])
+
+    listed = client.get("/api/v1/todos", headers=headers).json()["data"]
+    assert [(todo["id"], todo["is_completed"], todo["priority"]) for todo in listed] == [(ids[0], True, 3)]
+
+
+def test_cached_user_is_invalidated_on_account_deletion():
+    headers, _ = auth_headers()
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    # Served from the user cache, then deleted through the cached instance
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert client.delete("/api/v1/users/me", headers=headers).status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+
+
+def test_export_streams_ndjson():
+    headers, user_id = auth_headers()
+    seed_todos(user_id, 7, datetime(2025, 1, 1, tzinfo=timezone.utc))
+    deleted = client.post("/api/v1/todos", json={"title": "Gone"}, headers=headers).json()["data"]
+    client.delete(f"/api/v1/todos/{deleted['id']}", headers=headers)
+
+    response = client.get("/api/v1/todos/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 7
+
+    response = client.get("/api/v1/todos/export", params={"include_deleted": True}, headers=headers)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 8
+    assert lines[-1]["id"] == deleted["id"]
+    assert lines[-1]["is_deleted"] is True
+    # Every line is a TodoExport, with nothing outside the schema
+    assert all(TodoExport.model_validate(line).model_dump(mode="json", exclude_none=True) == line for line in lines)
+
+
+def test_ndjson_lines_span_chunks_and_drop_oversized_lines():
+    async def lines(*chunks):
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+        return [line async for line in iter_ndjson_lines(stream(), max_line_bytes=5)]
+
+    assert asyncio.run(lines(b"ab\ncd", b"e\n\nf", b"g")) == [b"ab", b"cde", b"", b"fg"]
+    assert asyncio.run(lines(b"toolong\nok\n", b"abc", b"def", b"gh\nlast")) == [None, b"ok", None, b"last"]
+    assert asyncio.run(lines(b"abc", b"defgh")) == [None]
+
+
+def test_import_commits_ndjson_in_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 3)
+    headers, _ = auth_headers()
+    lines = [json.dumps({"title": f"Imported {i}"}) for i in range(7)]
+    lines.insert(2, json.dumps({"priority": 1}))
+    lines.insert(5, "not json")
+    body = ("\n".join(lines) + "\n").encode()
+
+    # Split mid-line so lines span several body chunks
+    chunks = (body[i:i + 10] for i in range(0, len(body), 10))
+    response = client.post("/api/v1/todos/import", content=chunks, headers=headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["imported_count"] == 7
+    assert data["chunks_committed"] == 3
+    assert data["lines_read"] == 9
+    assert [failure["line"] for failure in data["failed"]] == [3, 6]
+
+    listed = client.get("/api/v1/todos", params={"limit": 100}, headers=headers).json()["data"]
+    assert len(listed) == 7
+
+
+def test_export_imports_as_is():
+    headers, _ = auth_headers()
+    original = client.post("/api/v1/todos", json={
+        "title": "Dentist", "description": "Bring forms", "priority": 2,
+        "isCompleted": True, "reminderAt": "2030-01-01T08:00:00Z",
+    }, headers=headers).json()["data"]
+    original = client.get(f"/api/v1/todos/{original['id']}", headers=headers).json()["data"]
+    exported = client.get("/api/v1/todos/export", headers=headers).content
+
+    other_headers, _ = auth_headers("other@example.com")
+    response = client.post("/api/v1/todos/import", content=exported, headers=other_headers)
+    assert response.json()["data"]["imported_count"] == 1
+    copy = client.get("/api/v1/todos", headers=other_headers).json()["data"][0]
+    fields = ("title", "description", "priority", "is_completed", "reminder_at", "is_deleted", "is_synced")
+    assert {name: copy[name] for name in fields} == {name: original[name] for name in fields}
+
+    # Keys outside the schema are rejected, not dropped
+    response = client.post("/api/v1/todos/import", content=b'{"title": "Typo", "isComplete": true}\n', headers=other_headers)
+    data = response.json()["data"]
+    assert (data["imported_count"], [failure["line"] for failure in data["failed"]]) == (0, [1])
+
+
+def test_search_ranks_pages_and_follows_writes():
+    headers, _ = auth_headers()
+    other_headers, _ = auth_headers("other@example.com")
+
+    def create(title, description=None, headers=headers):
+        body = {"title": title, "description": description}
+        return client.post("/api/v1/todos", json=body, headers=headers).json()["data"]["id"]
+
+    def search(q, **params):
+        response = client.get("/api/v1/todos/search", params={"q": q, **params}, headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    in_description = create("Errands", "buy groceries")
+    in_title = create("Groceries for the week")
+    deleted = create("Grocery list")
+    create("Groceries", headers=other_headers)
+    client.delete(f"/api/v1/todos/{deleted}", headers=headers)
+
+    # Prefix match, title above description, deleted and other users' todos excluded
+    assert [todo["id"] for todo in search("groc")["data"]] == [in_title, in_description]
+
+    renamed = create("Weekly review")
+    assert search("weekly")["data"][0]["id"] == renamed
+    client.patch(f"/api/v1/todos/{renamed}", json={"title": "Monthly review"}, headers=headers)
+    assert search("weekly")["data"] == []
+    assert [todo["id"] for todo in search("monthly review")["data"]] == [renamed]
+    # The last word is a prefix, even a single letter; earlier ones are whole words
+    assert [todo["id"] for todo in search("m")["data"]] == [renamed]
+    assert [todo["id"] for todo in search("monthly rev")["data"]] == [renamed]
+    assert search("month review")["data"] == []
+
+    # Title matches newest first, then description matches, across pages
+    titled = [create(f"Report {i}") for i in range(3)]
+    described = [create("Write-up", f"quarterly report {i}") for i in range(2)]
+    seen = []
+    cursor = None
+    while True:
+        body = search("report", limit=2, **({"cursor": cursor} if cursor else {}))
+        seen.extend(todo["id"] for todo in body["data"])
+        if not body["meta"].get("pagination"):
+            break
+        cursor = body["meta"]["pagination"]["next_cursor"]
+    assert seen == titled[::-1] + described[::-1]
+
+    response = client.get("/api/v1/todos/search", params={"q": "*:()"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_stats_counters_follow_every_write_path():
+    headers, user_id = auth_headers()
+    other_headers, _ = auth_headers("other@example.com")
+    client.post("/api/v1/todos", json={"title": "Not mine"}, headers=other_headers)
+
+    def stats():
+        response = client.get("/api/v1/todos/stats", headers=headers)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        return data["open"], data["completed"], {p["priority"]: (p["open"], p["completed"]) for p in data["by_priority"]}
+
+    assert stats() == (0, 0, {0: (0, 0), 1: (0, 0), 2: (0, 0), 3: (0, 0)})
+
+    first = client.post("/api/v1/todos", json={"title": "A", "priority": 3}, headers=headers).json()["data"]["id"]
+    created = client.post("/api/v1/todos/bulk/create", json={"todos": [
+        {"title": "B", "priority": 3}, {"title": "C", "isCompleted": True}, {"title": "D", "isDeleted": True},
+    ]}, headers=headers).json()["data"]["created"]
+    client.post("/api/v1/todos/import", content=b'{"title": "E", "priority": 1}\n', headers=headers)
+    assert stats() == (3, 1, {0: (0, 1), 1: (1, 0), 2: (0, 0), 3: (2, 0)})
+
+    client.patch(f"/api/v1/todos/{first}", json={"isCompleted": True}, headers=headers)
+    client.patch("/api/v1/todos/bulk", json={"ids": [created[0]["id"], created[1]["id"]], "changes": {"priority": 2}}, headers=headers)
+    client.delete(f"/api/v1/todos/{created[0]['id']}", headers=headers)
+    synced = str(uuid.uuid4())
+    client.post("/api/v1/todos/sync", json={"operations": [
+        {"op": "create", "id": synced, "updatedAt": "2030-01-01T10:00:00Z", "data": {"title": "F"}},
+        {"op": "update", "id": synced, "updatedAt": "2030-01-01T10:05:00Z", "data": {"priority": 1}},
+        {"op": "update", "id": first, "updatedAt": "2030-01-01T10:05:00Z", "data": {"isCompleted": False}},
+    ]}, headers=headers)
+    expected = (3, 1, {0: (0, 0), 1: (2, 0), 2: (0, 1), 3: (1, 0)})
+    assert stats() == expected
+
+    # The incremental counters agree with a recount from scratch
+    db = TestingSessionLocal()
+    try:
+        before = get_todo_stats(db, user_id)
+        rebuild_todo_counts(db)
+        db.commit()
+        assert get_todo_stats(db, user_id) == before
+    finally:
+        db.close()
+    assert stats() == expected
+
+    client.delete("/api/v1/todos", headers=headers)
+    assert stats() == (0, 0, {0: (0, 0), 1: (0, 0), 2: (0, 0), 3: (0, 0)})
+
+
+def test_stats_counters_match_counts_under_concurrent_writes(monkeypatch):
+    headers, user_id = auth_headers()
+    todo_id = client.post("/api/v1/todos", json={"title": "Contended"}, headers=headers).json()["data"]["id"]
+
+    # Widen the gap between reading a todo's bucket and writing the change
+    count_deltas = todo_crud.count_deltas
+
+    def slow_count_deltas(moves):
+        time.sleep(0.05)
+        return count_deltas(moves)
+
+    monkeypatch.setattr(todo_crud, "count_deltas", slow_count_deltas)
+
+    def concurrently(*changes):
+        barrier = threading.Barrier(len(changes))
+        errors = []
+
+        def run(change):
+            db = TestingSessionLocal()
+            try:
+                barrier.wait()
+                change(db)
+                db.commit()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=run, args=(change,)) for change in changes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+    concurrently(
+        lambda db: update_todo(db, user_id, todo_id, {"is_completed": True}),
+        lambda db: update_todo(db, user_id, todo_id, {"is_completed": True}),
+    )
+    concurrently(
+        lambda db: apply_sync_operations(db, user_id, [TodoSyncOperation.model_validate(
+            {"op": "update", "id": todo_id, "updatedAt": "2100-01-01T00:00:00Z", "data": {"isCompleted": False}}
+        )]),
+        lambda db: update_todo(db, user_id, todo_id, {"priority": 2}),
+    )
+    concurrently(
+        lambda db: bulk_update_todos(db, user_id, [todo_id], {"is_completed": True}),
+        lambda db: soft_delete_todo(db, user_id, todo_id),
+    )
+
+    db = TestingSessionLocal()
+    try:
+        counted = db.execute(
+            select(TodoModel.is_completed, TodoModel.priority, func.count())
+            .where(TodoModel.user_id == user_id, TodoModel.is_deleted == False)
+            .group_by(TodoModel.is_completed, TodoModel.priority)
+        ).all()
+        stats = get_todo_stats(db, user_id)
+    finally:
+        db.close()
+    actual = {}
+    for bucket in stats.by_priority:
+        actual[(False, bucket.priority)] = bucket.open
+        actual[(True, bucket.priority)] = bucket.completed
+    expected = dict.fromkeys(actual, 0)
+    expected.update({(is_completed, priority): count for is_completed, priority, count in counted})
+    assert actual == expected
+
+
+def test_reminder_scheduler_dispatches_due_reminders_once():
+    headers, _ = auth_headers()
+    now = datetime.now(timezone.utc)
+
+    def create(title, reminder_at, **fields):
+        body = {"title": title, "reminderAt": reminder_at.isoformat(), **fields}
+        return client.post("/api/v1/todos", json=body, headers=headers).json()["data"]["id"]
+
+    overdue = create("Overdue", now - timedelta(minutes=1))
+    soon = create("Soon", now + timedelta(minutes=30))
+    later = create("Later", now + timedelta(days=2))
+    create("Done", now - timedelta(minutes=1), isCompleted=True)
+
+    @asynccontextmanager
+    async def session_factory():
+        session = TestingSessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def new_scheduler(sink):
+        return ReminderScheduler(
+            window=3600, max_pending=100, reload_interval=300, batch_size=1,
+            sink=sink, session_factory=session_factory,
+        )
+
+    async def eventually(predicate):
+        for _ in range(100):
+            if predicate():
+                return
+            await asyncio.sleep(0.02)
+        assert predicate()
+
+    async def scenario():
+        sink = QueueSink(maxsize=10)
+        scheduler = new_scheduler(sink)
+        scheduler.start()
+        try:
+            assert (await asyncio.wait_for(sink.queue.get(), 5)).todo_id == overdue
+            # Only "Soon" falls within the window
+            await eventually(lambda: scheduler.stats()["scheduled"] == 1)
+
+            # Writes committed by this process reach the heap without a reload
+            past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+            await asyncio.to_thread(client.patch, f"/api/v1/todos/{soon}", json={"reminderAt": past}, headers=headers)
+            assert (await asyncio.wait_for(sink.queue.get(), 5)).todo_id == soon
+            await asyncio.to_thread(client.patch, f"/api/v1/todos/{overdue}", json={"reminderAt": past}, headers=headers)
+            assert (await asyncio.wait_for(sink.queue.get(), 5)).todo_id == overdue
+
+            upcoming = (datetime.now(timezone.utc) + timedelta(minutes=10)).isoformat()
+            await asyncio.to_thread(client.patch, f"/api/v1/todos/{later}", json={"reminderAt": upcoming}, headers=headers)
+            await eventually(lambda: scheduler.stats()["scheduled"] == 1)
+            await asyncio.to_thread(
+                client.patch, "/api/v1/todos/bulk",
+                json={"ids": [later], "changes": {"isCompleted": True}}, headers=headers,
+            )
+            await eventually(lambda: scheduler.stats()["scheduled"] == 0)
+            assert scheduler.stats()["dispatched"] == 3
+        finally:
+            await scheduler.stop()
+
+        # A reminder is claimed once: another worker finds nothing left to send
+        other = new_scheduler(QueueSink(maxsize=10))
+        assert await other.tick() == 0
+        assert other.stats()["scheduled"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_reminders_are_stored_in_utc_and_claims_keep_updated_at():
+    headers, _ = auth_headers()
+    local = "2030-01-01T10:00:00+02:00"
+    expected = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+
+    def stored_reminder(todo_id):
+        db = TestingSessionLocal()
+        try:
+            return make_aware(db.get(TodoModel, todo_id).reminder_at)
+        finally:
+            db.close()
+
+    created = client.post("/api/v1/todos", json={"title": "Call", "reminderAt": local}, headers=headers).json()["data"]["id"]
+    patched = client.post("/api/v1/todos", json={"title": "Email"}, headers=headers).json()["data"]["id"]
+    client.patch(f"/api/v1/todos/{patched}", json={"reminderAt": local}, headers=headers)
+    bulk = client.post("/api/v1/todos", json={"title": "Pay"}, headers=headers).json()["data"]["id"]
+    client.patch("/api/v1/todos/bulk", json={"ids": [bulk], "changes": {"reminderAt": local}}, headers=headers)
+    synced = str(uuid.uuid4())
+    client.post("/api/v1/todos/sync", json={"operations": [
+        {"op": "create", "id": synced, "updatedAt": "2030-01-01T00:00:00Z", "data": {"title": "Book", "reminderAt": local}},
+    ]}, headers=headers)
+    for todo_id in (created, patched, bulk, synced):
+        assert stored_reminder(todo_id) == expected
+
+    # Claiming a reminder is not an edit of the todo
+    db = TestingSessionLocal()
+    try:
+        updated_at = db.get(TodoModel, created).updated_at
+        claimed = claim_due_reminders(db, [created], expected)
+        db.commit()
+        assert [reminder.todo_id for reminder in claimed] == [created]
+        db.expire_all()
+        todo = db.get(TodoModel, created)
+        assert todo.reminder_sent_at is not None
+        assert todo.updated_at == updated_at
+    finally:
+        db.close()
+
+
+def test_metrics_exposes_route_templates():
+    headers, _ = auth_headers()
+    todo_id = client.post("/api/v1/todos", json={"title": "Measured"}, headers=headers).json()["data"]["id"]
+    client.get(f"/api/v1/todos/{todo_id}", headers=headers)
+    client.get(f"/api/v1/todos/{uuid.uuid4()}", headers=headers)
+    # A parameter value that is also a literal segment of the path
+    client.get("/api/v1/todos/todos", headers=headers)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'flow_http_requests_total{method="GET",route="/api/v1/todos/{todo_id}",status="404"} 2' in lines
+    assert any(
+        line.startswith('flow_http_request_duration_seconds_bucket{method="GET",route="/api/v1/todos/{todo_id}",le="+Inf"}')
+        for line in lines
+    )
+    assert not any(todo_id in line for line in lines)
+    assert any(line.startswith("flow_threadpool_tokens ") for line in lines)
+    assert any(line.startswith('flow_db_pool_checkouts_total{engine="sync"}') for line in lines)
+    assert any(line.startswith('flow_db_pool_checkout_wait_seconds_total{engine="sync"}') for line in lines)
+    # Monotonic stats are counters, levels are gauges
+    assert "# TYPE flow_db_pool_checkouts_total counter" in lines
+    assert "# TYPE flow_cache_hits_total counter" in lines
+    assert "# TYPE flow_rate_limiter_limited_total counter" in lines
+    assert "# TYPE flow_worker_pool_rejected_total counter" in lines
+    assert "# TYPE flow_db_pool_checkedout gauge" in lines
+
+
+def test_endpoints_on_async_session(engine_test):
+    # NullPool: each TestClient request runs on its own event loop
+    async_engine = create_async_engine(engine_test.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_async_db
+
+    headers, _ = auth_headers("async@example.com")
+    created = client.post("/api/v1/todos", json={"title": "Async"}, headers=headers)
+    assert created.status_code == 201
+    todo_id = created.json()["data"]["id"]
+
+    patched = client.patch(f"/api/v1/todos/{todo_id}", json={"isCompleted": True}, headers=headers)
+    assert patched.json()["data"]["is_completed"] is True
+
+    listed = client.get("/api/v1/todos", headers=headers).json()["data"]
+    assert [todo["id"] for todo in listed] == [todo_id]
+
+    assert client.delete(f"/api/v1/todos/{todo_id}", headers=headers).status_code == 200
+    changes = client.get("/api/v1/todos/changes", headers=headers).json()["data"]
+    assert changes[0]["is_deleted"] is True
+
+    exported = client.get("/api/v1/todos/export", params={"include_deleted": True}, headers=headers)
+    assert [json.loads(line)["id"] for line in exported.text.splitlines()] == [todo_id]
+
+    assert client.get("/api/v1/health").json()["data"]["database"] == "healthy"